@@ -1,12 +1,14 @@
-from flask import Flask
+from flask import Flask, current_app, jsonify
 from flask_bcrypt import Bcrypt
 from flask_login import LoginManager
 from flask_mail import Mail
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
+from pymongo.errors import PyMongoError
 
 from app.config import Config
-from app.extensions import init_mongo
+from app.extensions import init_mongo, get_client
+from app.utils.json_provider import OrjsonProvider
 
 bcrypt = Bcrypt()
 mail = Mail()
@@ -20,6 +22,7 @@ login_manager.login_message = None
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.json = OrjsonProvider(app)
     
     # Disable strict slashes to prevent 308 redirects that break CORS preflight
     app.url_map.strict_slashes = False
@@ -63,6 +66,18 @@ def create_app(config_class=Config):
     app.register_blueprint(notifications_bp, url_prefix='/api/v1/notifications')
     app.register_blueprint(wellness_bp, url_prefix='/api/v1/wellness')
 
+    @app.route('/api/v1/health', methods=['GET'])
+    def health():
+        # Fails fast (server selection / pool checkout timeouts) so a load
+        # balancer can take a worker with a stuck pool out of rotation
+        try:
+            get_client().admin.command('ping')
+        except PyMongoError:
+            # Details (hosts, topology) go to the log, not to the caller
+            current_app.logger.exception("Health check: MongoDB ping failed")
+            return jsonify({"status": "unavailable"}), 503
+        return jsonify({"status": "ok"})
+
     return app
 
 from app.users.model import User
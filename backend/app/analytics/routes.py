@@ -5,6 +5,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from bson import ObjectId
 from datetime import datetime, timedelta
 from app.extensions import db as mongo
+from app.utils.ids import to_object_id
 
 analytics_bp = Blueprint("analytics", __name__)
 
@@ -70,7 +71,7 @@ def overview():
     - monthly_trend: Monthly totals for the last 6 months
     """
     uid = get_jwt_identity()
-    user_oid = ObjectId(uid)
+    user_oid = to_object_id(uid)
     
     # Get all event IDs user participates in
     participant_docs = list(mongo.participants.find({"user_id": user_oid}, {"event_id": 1}))
@@ -2,8 +2,8 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from bcrypt import hashpw, gensalt, checkpw
 from datetime import datetime
-from bson import ObjectId
 from app.extensions import db
+from app.utils.ids import to_object_id
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -64,7 +64,7 @@ def login():
 @jwt_required()
 def me():
     uid = get_jwt_identity()
-    user = db.users.find_one({"_id": ObjectId(uid)})
+    user = db.users.find_one({"_id": to_object_id(uid)})
 
     if not user:
         return jsonify({"error": "User not found"}), 404
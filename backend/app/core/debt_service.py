@@ -103,6 +103,31 @@ class DebtService:
         if debt["status"] == DebtStatus.SETTLED:
             return False, "Debt already settled"
         
+        mongo.debts.update_one(
+            {"_id": ObjectId(debt_id)},
+            cls.build_settlement_update(debt, payment_id, amount)
+        )
+        
+        # Update user metrics
+        cls._update_user_debt_metrics(str(debt["user_id"]))
+        
+        return True, None
+    
+    @classmethod
+    def build_settlement_update(
+        cls,
+        debt: Dict,
+        payment_id: str,
+        amount: float,
+        now: Optional[datetime] = None
+    ) -> Dict:
+        """
+        Build the update document applying a payment to a debt.
+        
+        Pure function of the debt snapshot so callers can batch several
+        settlements into one bulk_write.
+        """
+        now = now or datetime.utcnow()
         amount = round(float(amount), 2)
         remaining = float(debt["amount_remaining"])
         
@@ -116,31 +141,22 @@ class DebtService:
         else:
             new_status = DebtStatus.PARTIALLY_PAID
         
-        # Update debt
-        mongo.debts.update_one(
-            {"_id": ObjectId(debt_id)},
-            {
-                "$set": {
-                    "amount_remaining": round(new_remaining, 2),
-                    "amount_paid": round(new_paid, 2),
-                    "status": new_status,
-                    "updated_at": datetime.utcnow(),
-                    "settled_at": datetime.utcnow() if new_status == DebtStatus.SETTLED else None
-                },
-                "$push": {
-                    "payments": {
-                        "payment_id": payment_id,
-                        "amount": min(amount, remaining),
-                        "paid_at": datetime.utcnow()
-                    }
+        return {
+            "$set": {
+                "amount_remaining": round(new_remaining, 2),
+                "amount_paid": round(new_paid, 2),
+                "status": new_status,
+                "updated_at": now,
+                "settled_at": now if new_status == DebtStatus.SETTLED else None
+            },
+            "$push": {
+                "payments": {
+                    "payment_id": payment_id,
+                    "amount": min(amount, remaining),
+                    "paid_at": now
                 }
             }
-        )
-        
-        # Update user metrics
-        cls._update_user_debt_metrics(str(debt["user_id"]))
-        
-        return True, None
+        }
     
     @classmethod
     def forgive_debt(
@@ -95,6 +95,8 @@ class JoinRequestService:
         # Determine if approval is required
         requires_approval = rules.get("require_join_approval", False) if rules else False
         
+        now = datetime.utcnow()
+        
         # Create participant record
         participant = {
             "event_id": ObjectId(event_id),
@@ -106,10 +108,10 @@ class JoinRequestService:
             "available_contribution": 0,
             "status": JoinStatus.PENDING if requires_approval else JoinStatus.APPROVED,
             "rules_accepted": accepted_rules,
-            "rules_accepted_at": datetime.utcnow() if accepted_rules else None,
+            "rules_accepted_at": now if accepted_rules else None,
             "joined_via": "request",
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
+            "created_at": now,
+            "updated_at": now
         }
         
         result = mongo.participants.insert_one(participant)
@@ -125,7 +127,7 @@ class JoinRequestService:
             "intended_deposit": deposit_amount,
             "status": JoinStatus.PENDING if requires_approval else JoinStatus.APPROVED,
             "rules_accepted": accepted_rules,
-            "created_at": datetime.utcnow()
+            "created_at": now
         })
         
         # Notify creator
@@ -177,6 +179,8 @@ class JoinRequestService:
         if not participant:
             return False, "No pending join request found"
         
+        now = datetime.utcnow()
+        
         # Update status
         mongo.participants.update_one(
             {"_id": participant["_id"]},
@@ -184,8 +188,8 @@ class JoinRequestService:
                 "$set": {
                     "status": JoinStatus.APPROVED,
                     "approved_by": ObjectId(approver_id),
-                    "approved_at": datetime.utcnow(),
-                    "updated_at": datetime.utcnow()
+                    "approved_at": now,
+                    "updated_at": now
                 }
             }
         )
@@ -201,7 +205,7 @@ class JoinRequestService:
                 "$set": {
                     "status": JoinStatus.APPROVED,
                     "approved_by": ObjectId(approver_id),
-                    "approved_at": datetime.utcnow()
+                    "approved_at": now
                 }
             }
         )
@@ -212,7 +216,7 @@ class JoinRequestService:
             "event_id": ObjectId(event_id),
             "user_id": ObjectId(user_id),
             "approved_by": ObjectId(approver_id),
-            "created_at": datetime.utcnow()
+            "created_at": now
         })
         
         # Notify user
@@ -264,6 +268,8 @@ class JoinRequestService:
         if not participant:
             return False, "No pending join request found"
         
+        now = datetime.utcnow()
+        
         # Update status
         mongo.participants.update_one(
             {"_id": participant["_id"]},
@@ -271,9 +277,9 @@ class JoinRequestService:
                 "$set": {
                     "status": JoinStatus.REJECTED,
                     "rejected_by": ObjectId(rejector_id),
-                    "rejected_at": datetime.utcnow(),
+                    "rejected_at": now,
                     "rejection_reason": reason,
-                    "updated_at": datetime.utcnow()
+                    "updated_at": now
                 }
             }
         )
@@ -289,7 +295,7 @@ class JoinRequestService:
                 "$set": {
                     "status": JoinStatus.REJECTED,
                     "rejected_by": ObjectId(rejector_id),
-                    "rejected_at": datetime.utcnow(),
+                    "rejected_at": now,
                     "rejection_reason": reason
                 }
             }
@@ -350,15 +356,17 @@ class JoinRequestService:
         if not success:
             return False, message
         
+        now = datetime.utcnow()
+        
         # Activate participant
         mongo.participants.update_one(
             {"_id": participant["_id"]},
             {
                 "$set": {
                     "status": JoinStatus.ACTIVE,
-                    "activated_at": datetime.utcnow(),
+                    "activated_at": now,
                     "join_payment_id": payment_id,
-                    "updated_at": datetime.utcnow()
+                    "updated_at": now
                 }
             }
         )
@@ -370,7 +378,7 @@ class JoinRequestService:
             "user_id": ObjectId(user_id),
             "amount": amount,
             "payment_id": payment_id,
-            "created_at": datetime.utcnow()
+            "created_at": now
         })
         
         return True, None
@@ -383,13 +391,21 @@ class JoinRequestService:
             "status": JoinStatus.PENDING
         }).sort("created_at", 1))
         
+        # Get user info for all requesters in one query
+        users = {
+            u["_id"]: u
+            for u in mongo.users.find(
+                {"_id": {"$in": [r["user_id"] for r in requests]}},
+                {"name": 1, "email": 1}
+            )
+        }
+        
         for r in requests:
+            user = users.get(r["user_id"])
             r["_id"] = str(r["_id"])
             r["event_id"] = str(r["event_id"])
             r["user_id"] = str(r["user_id"])
             
-            # Get user info
-            user = mongo.users.find_one({"_id": ObjectId(r["user_id"])})
             if user:
                 r["user_name"] = user.get("name", "Unknown")
                 r["user_email"] = user.get("email", "")
@@ -430,13 +446,15 @@ class JoinRequestService:
         if not participant:
             return False, "Participant not found"
         
+        now = datetime.utcnow()
+        
         mongo.participants.update_one(
             {"_id": participant["_id"]},
             {
                 "$set": {
                     "rules_accepted": True,
-                    "rules_accepted_at": datetime.utcnow(),
-                    "updated_at": datetime.utcnow()
+                    "rules_accepted_at": now,
+                    "updated_at": now
                 }
             }
         )
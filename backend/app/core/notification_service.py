@@ -12,7 +12,7 @@ from datetime import datetime
 from typing import Optional, Dict, Any, List
 from bson import ObjectId
 
-from app.extensions import db as mongo
+from app.extensions import db as mongo, executor
 
 
 class NotificationType:
@@ -46,6 +46,13 @@ class NotificationType:
     DEPOSIT_CONFIRMED = "deposit_confirmed"
 
 
+def _log_failure(future) -> None:
+    """Report a background notification batch that failed."""
+    error = future.exception()
+    if error is not None:
+        print(f"[NotificationService] Failed to send notifications: {error}")
+
+
 class NotificationService:
     """Service for managing notifications."""
     
@@ -91,20 +98,72 @@ class NotificationService:
         
         return str(result.inserted_id)
     
+    @classmethod
+    def create_notifications(cls, notifications: List[Dict]) -> List[str]:
+        """
+        Create several notifications in one round trip.
+        
+        Args:
+            notifications: Dicts with the create_notification arguments
+                (user_id, notification_type, title, message, data, priority)
+            
+        Returns:
+            Notification IDs, in input order
+        """
+        if not notifications:
+            return []
+        
+        now = datetime.utcnow()
+        docs = [{
+            "user_id": ObjectId(n["user_id"]),
+            "type": n["notification_type"],
+            "title": n["title"],
+            "message": n["message"],
+            "data": n.get("data") or {},
+            "priority": n.get("priority", "normal"),
+            "read": False,
+            "created_at": now
+        } for n in notifications]
+        
+        result = mongo.notifications.insert_many(docs)
+        
+        mongo.notification_queue.insert_many([
+            cls._realtime_entry(str(doc["user_id"]), doc) for doc in docs
+        ])
+        
+        return [str(i) for i in result.inserted_ids]
+    
+    @classmethod
+    def create_notifications_later(cls, notifications: List[Dict]) -> None:
+        """
+        Run create_notifications on the shared executor instead of the
+        request thread.
+        
+        For fan-out the caller doesn't need to wait on; failures are
+        logged rather than raised.
+        """
+        if notifications:
+            executor.submit(cls.create_notifications, notifications).add_done_callback(_log_failure)
+    
     @classmethod
     def _push_realtime(cls, user_id: str, notification: Dict) -> None:
         """Push notification to real-time channel (WebSocket/SSE)."""
         # This would integrate with a real-time service like Socket.IO or Redis pub/sub
         # For now, we store in a queue collection that can be polled
+        mongo.notification_queue.insert_one(cls._realtime_entry(user_id, notification))
+    
+    @classmethod
+    def _realtime_entry(cls, user_id: str, notification: Dict) -> Dict:
+        """Build the notification_queue document for a stored notification."""
         notification_copy = notification.copy()
         notification_copy["user_id"] = str(notification_copy["user_id"])
         
-        mongo.notification_queue.insert_one({
+        return {
             "user_id": user_id,
             "notification": notification_copy,
             "delivered": False,
             "created_at": datetime.utcnow()
-        })
+        }
     
     # ==================== PAYMENT NOTIFICATIONS ====================
     
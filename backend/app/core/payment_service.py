@@ -429,12 +429,15 @@ class PaymentService:
         elif purpose == PaymentPurpose.WALLET_TOPUP:
             if user_id:
                 from .wallet_service import WalletFallbackService
-                WalletFallbackService.credit_wallet(
+                credited, _ = WalletFallbackService.credit_wallet(
                     user_id=user_id,
                     amount=amount,
                     source="topup",
                     reference_id=payment.get("finternet_id") or payment.get("_id")
                 )
+                if not credited:
+                    print(f"[PaymentService] Wallet top-up not credited, invalid amount: {amount}")
+                    return
                 
                 NotificationService.notify_payment_confirmed(
                     user_id=user_id,
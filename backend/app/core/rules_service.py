@@ -14,6 +14,7 @@ from typing import Optional, Dict, Any, List, Tuple
 from bson import ObjectId
 
 from app.extensions import db as mongo
+from app.utils.request_cache import get_event
 
 
 class RuleViolationType:
@@ -39,7 +40,7 @@ class RuleEnforcementService:
         
         Returns default rules if none set.
         """
-        event = mongo.events.find_one({"_id": ObjectId(event_id)})
+        event = get_event(event_id)
         if not event:
             return {}
         
@@ -69,7 +70,9 @@ class RuleEnforcementService:
             "max_debt_allowed": None,  # Maximum debt per user
         }
         
-        event_rules = event.get("rules", {})
+        # Copy so the merge doesn't write defaults into the (possibly
+        # shared) event document
+        event_rules = dict(event.get("rules") or {})
         
         # Merge with defaults
         for key, default in default_rules.items():
@@ -205,7 +208,7 @@ class RuleEnforcementService:
                         return False, f"{user_name}'s cumulative spend would exceed limit (${max_cumulative:.2f})", RuleViolationType.MAX_CUMULATIVE_SPEND, False
         
         # Check pool availability
-        event = mongo.events.find_one({"_id": ObjectId(event_id)})
+        event = get_event(event_id)
         if event:
             available = event.get("total_pool", 0) - event.get("total_spent", 0)
             if amount > available:
@@ -356,6 +359,8 @@ class RuleEnforcementService:
         Returns:
             Tuple of (success, error_message)
         """
+        from app.events.routes import invalidate_invite_cache
+        
         event = mongo.events.find_one({"_id": ObjectId(event_id)})
         
         if not event:
@@ -377,6 +382,8 @@ class RuleEnforcementService:
                 }
             }
         )
+        # The public invite preview shows the deposit range
+        invalidate_invite_cache(event)
         
         # Record rule change activity
         mongo.activities.insert_one({
@@ -8,10 +8,11 @@ Responsibilities:
 - Handle wallet top-ups
 """
 from datetime import datetime
-from typing import Optional, Dict, Any, Tuple, List
+from typing import Optional, Dict, Any, Tuple, List, Iterator
 from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
 
-from app.extensions import db as mongo
+from app.extensions import db as mongo, executor, run_in_transaction
 
 
 class WalletFallbackService:
@@ -54,6 +55,11 @@ class WalletFallbackService:
             Tuple of (success, new_balance)
         """
         amount = round(float(amount), 2)
+        if amount <= 0:
+            # Nothing to credit - don't write a no-op transaction row
+            return False, 0.0
+        
+        now = datetime.utcnow()
         
         # Ensure wallet exists
         wallet = mongo.wallets.find_one({"user_id": ObjectId(user_id)})
@@ -61,8 +67,8 @@ class WalletFallbackService:
             result = mongo.wallets.insert_one({
                 "user_id": ObjectId(user_id),
                 "balance": amount,
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow()
+                "created_at": now,
+                "updated_at": now
             })
             wallet_id = result.inserted_id
             new_balance = amount
@@ -72,7 +78,7 @@ class WalletFallbackService:
                 {"_id": wallet_id},
                 {
                     "$inc": {"balance": amount},
-                    "$set": {"updated_at": datetime.utcnow()}
+                    "$set": {"updated_at": now}
                 }
             )
             new_balance = float(wallet.get("balance", 0)) + amount
@@ -87,11 +93,77 @@ class WalletFallbackService:
             "reference_id": reference_id,
             "notes": notes,
             "balance_after": new_balance,
-            "created_at": datetime.utcnow()
+            "created_at": now
         })
         
         return True, round(new_balance, 2)
     
+    @classmethod
+    def credit_wallets(
+        cls,
+        credits: List[Tuple[str, float]],
+        source: str,
+        reference_id: Optional[str] = None,
+        notes: Optional[str] = None
+    ) -> Dict[str, float]:
+        """
+        Credit several personal wallets, issuing the increments concurrently.
+        
+        Args:
+            credits: (user_id, amount) pairs; non-positive amounts are skipped
+            source: Source of credit (event_settlement, refund, etc.)
+            reference_id: Reference to payment/transaction
+            notes: Optional notes
+            
+        Returns:
+            Dict of user_id -> new balance for every wallet credited
+        """
+        amounts = {}
+        for user_id, amount in credits:
+            amount = round(float(amount), 2)
+            if amount > 0:
+                amounts[ObjectId(user_id)] = amount
+        if not amounts:
+            return {}
+        
+        now = datetime.utcnow()
+        
+        # Each upsert returns the wallet as it was right after its own
+        # increment, so balance_after matches the stored balance
+        futures = {
+            user_oid: executor.submit(
+                mongo.wallets.find_one_and_update,
+                {"user_id": user_oid},
+                {
+                    "$inc": {"balance": amount},
+                    "$set": {"updated_at": now},
+                    "$setOnInsert": {"created_at": now}
+                },
+                projection={"balance": 1},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            for user_oid, amount in amounts.items()
+        }
+        wallets = {user_oid: future.result() for user_oid, future in futures.items()}
+        
+        mongo.wallet_transactions.insert_many([{
+            "wallet_id": wallets[user_oid]["_id"],
+            "user_id": user_oid,
+            "type": "credit",
+            "amount": amount,
+            "source": source,
+            "reference_id": reference_id,
+            "notes": notes,
+            "balance_after": float(wallets[user_oid].get("balance", 0)),
+            "created_at": now
+        } for user_oid, amount in amounts.items()], ordered=False)
+        
+        return {
+            str(user_oid): round(float(wallets[user_oid].get("balance", 0)), 2)
+            for user_oid in amounts
+        }
+    
     @classmethod
     def debit_wallet(
         cls,
@@ -115,6 +187,8 @@ class WalletFallbackService:
             Tuple of (success, error_message, amount_debited)
         """
         amount = round(float(amount), 2)
+        if amount <= 0:
+            return False, "Debit amount must be positive", 0.0
         
         wallet = mongo.wallets.find_one({"user_id": ObjectId(user_id)})
         if not wallet:
@@ -126,12 +200,13 @@ class WalletFallbackService:
             return False, f"Insufficient wallet balance (${current_balance:.2f})", 0.0
         
         new_balance = current_balance - amount
+        now = datetime.utcnow()
         
         mongo.wallets.update_one(
             {"_id": wallet["_id"]},
             {
                 "$inc": {"balance": -amount},
-                "$set": {"updated_at": datetime.utcnow()}
+                "$set": {"updated_at": now}
             }
         )
         
@@ -145,7 +220,7 @@ class WalletFallbackService:
             "reference_id": reference_id,
             "notes": notes,
             "balance_after": new_balance,
-            "created_at": datetime.utcnow()
+            "created_at": now
         })
         
         return True, None, amount
@@ -164,8 +239,8 @@ class WalletFallbackService:
         
         Logic:
         1. Calculate shortfall
-        2. Try to debit from personal wallet
-        3. If wallet insufficient, create debt record
+        2. Debit from personal wallet if it covers the full shortfall
+        3. Otherwise debit what the wallet has and create a debt record
         
         Args:
             user_id: User ID
@@ -185,30 +260,45 @@ class WalletFallbackService:
         if shortfall <= 0:
             return True, None
         
-        # Try wallet debit
-        wallet_balance = cls.get_wallet_balance(user_id)
+        # Common case: debit the full shortfall in one conditional update,
+        # which only matches when the wallet balance covers it
+        now = datetime.utcnow()
+        debit_amount = round(float(shortfall), 2)
+        wallet = mongo.wallets.find_one_and_update(
+            {"user_id": ObjectId(user_id), "balance": {"$gte": debit_amount}},
+            {
+                "$inc": {"balance": -debit_amount},
+                "$set": {"updated_at": now}
+            },
+            projection={"balance": 1},
+            return_document=ReturnDocument.AFTER
+        )
         
-        if wallet_balance >= shortfall:
-            # Wallet covers shortfall
-            success, error, _ = cls.debit_wallet(
-                user_id=user_id,
-                amount=shortfall,
-                purpose="expense_shortfall",
-                reference_id=expense_id,
-                notes=f"Covered shortfall for expense in event {event_id}"
-            )
+        if wallet is not None:
+            mongo.wallet_transactions.insert_one({
+                "wallet_id": wallet["_id"],
+                "user_id": ObjectId(user_id),
+                "type": "debit",
+                "amount": debit_amount,
+                "purpose": "expense_shortfall",
+                "reference_id": expense_id,
+                "notes": f"Covered shortfall for expense in event {event_id}",
+                "balance_after": float(wallet["balance"]),
+                "created_at": now
+            })
             
-            if success:
-                # Record that wallet was used
-                mongo.wallet_usage.insert_one({
-                    "user_id": ObjectId(user_id),
-                    "event_id": ObjectId(event_id),
-                    "expense_id": ObjectId(expense_id),
-                    "amount": shortfall,
-                    "type": "shortfall_coverage",
-                    "created_at": datetime.utcnow()
-                })
-                return True, None
+            # Record that wallet was used
+            mongo.wallet_usage.insert_one({
+                "user_id": ObjectId(user_id),
+                "event_id": ObjectId(event_id),
+                "expense_id": ObjectId(expense_id),
+                "amount": shortfall,
+                "type": "shortfall_coverage",
+                "created_at": now
+            })
+            return True, None
+        
+        wallet_balance = cls.get_wallet_balance(user_id)
         
         # Wallet insufficient - calculate remaining debt
         wallet_contribution = min(wallet_balance, shortfall)
@@ -267,7 +357,10 @@ class WalletFallbackService:
         Returns:
             Tuple of (success, result_info)
         """
-        from .debt_service import DebtService
+        from .debt_service import DebtService, DebtStatus
+        
+        if amount <= 0:
+            return False, {"error": "Top-up amount must be positive"}
         
         # Credit wallet
         success, new_balance = cls.credit_wallet(
@@ -290,40 +383,126 @@ class WalletFallbackService:
         if apply_to_debts:
             outstanding = DebtService.get_user_outstanding_debts(user_id)
             
+            # Plan every settlement up front so the writes go out as one batch
+            now = datetime.utcnow()
             remaining_balance = new_balance
+            debt_ops = []
+            planned = []
+            # Tags this batch's payment entries so they can be told apart
+            # from earlier payments that reused the same payment_id
+            batch_id = ObjectId()
             for debt in outstanding:
                 if remaining_balance <= 0:
                     break
                 
                 debt_amount = float(debt["amount_remaining"])
-                settle_amount = min(remaining_balance, debt_amount)
+                settle_amount = round(min(remaining_balance, debt_amount), 2)
+                remaining_balance = round(remaining_balance - settle_amount, 2)
+                
+                update = DebtService.build_settlement_update(debt, payment_id, settle_amount, now)
+                update["$push"]["payments"]["batch_id"] = batch_id
                 
-                # Settle debt
-                success, _ = DebtService.settle_debt(
-                    debt_id=debt["_id"],
-                    payment_id=payment_id,
-                    amount=settle_amount
+                # Only matches if nobody paid this debt since it was read
+                debt_ops.append(UpdateOne(
+                    {
+                        "_id": ObjectId(debt["_id"]),
+                        "status": {"$in": [DebtStatus.OUTSTANDING, DebtStatus.PARTIALLY_PAID]},
+                        "amount_remaining": debt["amount_remaining"]
+                    },
+                    update
+                ))
+                planned.append((debt["_id"], settle_amount))
+            
+            def apply_settlements(session):
+                applied = planned
+                write = mongo.debts.bulk_write(debt_ops, ordered=False, session=session)
+                if write.matched_count != len(debt_ops):
+                    # A concurrent payment moved some debts; only charge for
+                    # the ones this batch actually settled
+                    changed = {
+                        d["_id"] for d in mongo.debts.find(
+                            {
+                                "_id": {"$in": [ObjectId(debt_id) for debt_id, _ in planned]},
+                                "payments.batch_id": batch_id
+                            },
+                            {"_id": 1},
+                            session=session
+                        )
+                    }
+                    applied = [p for p in planned if ObjectId(p[0]) in changed]
+                if not applied:
+                    return applied, new_balance
+                
+                total_settled = round(sum(amount for _, amount in applied), 2)
+                wallet = mongo.wallets.find_one_and_update(
+                    {"user_id": ObjectId(user_id), "balance": {"$gte": total_settled}},
+                    {
+                        "$inc": {"balance": -total_settled},
+                        "$set": {"updated_at": now}
+                    },
+                    projection={"balance": 1},
+                    return_document=ReturnDocument.AFTER,
+                    session=session
                 )
+                if wallet is None:
+                    # Balance was spent since the top-up; abort the settlements
+                    raise RuntimeError("Wallet balance no longer covers the planned settlements")
                 
-                if success:
-                    # Debit from wallet
-                    cls.debit_wallet(
-                        user_id=user_id,
-                        amount=settle_amount,
-                        purpose="debt_settlement",
-                        reference_id=debt["_id"]
-                    )
-                    
-                    remaining_balance -= settle_amount
-                    result["debts_settled"].append({
-                        "debt_id": debt["_id"],
-                        "amount": settle_amount
+                transactions = []
+                balance_after = round(float(wallet["balance"]) + total_settled, 2)
+                for debt_id, amount in applied:
+                    balance_after = round(balance_after - amount, 2)
+                    transactions.append({
+                        "wallet_id": wallet["_id"],
+                        "user_id": ObjectId(user_id),
+                        "type": "debit",
+                        "amount": amount,
+                        "purpose": "debt_settlement",
+                        "reference_id": debt_id,
+                        "notes": None,
+                        "balance_after": balance_after,
+                        "created_at": now
                     })
+                mongo.wallet_transactions.insert_many(transactions, session=session)
+                return applied, float(wallet["balance"])
+            
+            applied, remaining_balance = [], new_balance
+            if debt_ops:
+                try:
+                    applied, remaining_balance = run_in_transaction(apply_settlements)
+                except RuntimeError as e:
+                    print(f"[WalletService] Skipped debt settlement for top-up {payment_id}: {e}")
+                    remaining_balance = cls.get_wallet_balance(user_id)
+            if applied:
+                DebtService._update_user_debt_metrics(user_id)
             
+            result["debts_settled"] = [
+                {"debt_id": debt_id, "amount": amount} for debt_id, amount in applied
+            ]
             result["new_balance"] = remaining_balance
         
         return True, result
     
+    @classmethod
+    def iter_wallet_transactions(
+        cls,
+        user_id: str,
+        limit: int = 50,
+        skip: int = 0
+    ) -> Iterator[Dict]:
+        """Yield wallet transactions newest first, with ids stringified."""
+        yield from mongo.wallet_transactions.aggregate([
+            {"$match": {"user_id": ObjectId(user_id)}},
+            {"$sort": {"created_at": -1}},
+            {"$skip": skip},
+            {"$limit": limit},
+            {"$addFields": {
+                "_id": {"$toString": "$_id"},
+                "user_id": {"$toString": "$user_id"},
+                "wallet_id": {"$toString": "$wallet_id"}
+            }}
+        ])
+    
     @classmethod
     def get_wallet_transactions(
         cls,
@@ -331,13 +510,4 @@ class WalletFallbackService:
         limit: int = 50
     ) -> List[Dict]:
         """Get wallet transaction history."""
-        transactions = list(mongo.wallet_transactions.find({
-            "user_id": ObjectId(user_id)
-        }).sort("created_at", -1).limit(limit))
-        
-        for t in transactions:
-            t["_id"] = str(t["_id"])
-            t["user_id"] = str(t["user_id"])
-            t["wallet_id"] = str(t["wallet_id"])
-        
-        return transactions
+        return list(cls.iter_wallet_transactions(user_id, limit=limit))
@@ -1,7 +1,7 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from bson import ObjectId
 from app.extensions import db as mongo
+from app.utils.ids import to_object_id
 
 bp = Blueprint("dashboards", __name__)
 
@@ -11,6 +11,50 @@ def summary(user_id):
     return jsonify({"user_id": user_id, "summary": {}})
 
 
+# Stages after $match/$sort/$limit are the same for every request, so build
+# them once. The driver only reads the pipeline, so sharing them is safe.
+_RECENT_ACTIVITY_STAGES = (
+    # Drop fields the lookups and final projection don't need
+    {"$project": {
+        "type": 1,
+        "description": 1,
+        "amount": 1,
+        "event_id": 1,
+        "user_id": 1,
+        "created_at": 1
+    }},
+
+    # Lookup event name
+    {"$lookup": {
+        "from": "events",
+        "localField": "event_id",
+        "foreignField": "_id",
+        "as": "event_info"
+    }},
+
+    # Lookup user name (who performed the action)
+    {"$lookup": {
+        "from": "users",
+        "localField": "user_id",
+        "foreignField": "_id",
+        "as": "user_info"
+    }},
+
+    # Project final fields
+    {"$project": {
+        "_id": {"$toString": "$_id"},
+        "type": {"$trim": {"input": "$type"}},
+        "description": "$description",
+        "amount": "$amount",
+        "event_id": {"$toString": "$event_id"},
+        "event_name": {"$arrayElemAt": ["$event_info.name", 0]},
+        "payer_id": {"$toString": "$user_id"},
+        "payer_name": {"$arrayElemAt": ["$user_info.name", 0]},
+        "created_at": "$created_at"
+    }}
+)
+
+
 @bp.route("/recent-activity", methods=["GET"])
 @jwt_required()
 def recent_activity():
@@ -19,7 +63,7 @@ def recent_activity():
     Uses $lookup, $match, $sort, $limit for efficient querying.
     """
     uid = get_jwt_identity()
-    user_oid = ObjectId(uid)
+    user_oid = to_object_id(uid)
     limit = request.args.get("limit", 5, type=int)
     limit = min(limit, 50)  # Cap at 50
     
@@ -40,45 +84,10 @@ def recent_activity():
         
         # Limit to requested number
         {"$limit": limit},
-        
-        # Lookup event name
-        {"$lookup": {
-            "from": "events",
-            "localField": "event_id",
-            "foreignField": "_id",
-            "as": "event_info"
-        }},
-        
-        # Lookup user name (who performed the action)
-        {"$lookup": {
-            "from": "users",
-            "localField": "user_id",
-            "foreignField": "_id",
-            "as": "user_info"
-        }},
-        
-        # Project final fields
-        {"$project": {
-            "_id": {"$toString": "$_id"},
-            "type": {"$trim": {"input": "$type"}},
-            "description": "$description",
-            "amount": "$amount",
-            "event_id": {"$toString": "$event_id"},
-            "event_name": {"$arrayElemAt": ["$event_info.name", 0]},
-            "payer_id": {"$toString": "$user_id"},
-            "payer_name": {"$arrayElemAt": ["$user_info.name", 0]},
-            "created_at": "$created_at"
-        }}
+
+        *_RECENT_ACTIVITY_STAGES
     ]
     
     activities = list(mongo.activities.aggregate(pipeline))
     
-    # Convert datetime to ISO string for JSON serialization and normalize type
-    for activity in activities:
-        if activity.get("created_at"):
-            activity["created_at"] = activity["created_at"].isoformat()
-        # Normalize type field (strip whitespace/newlines)
-        if activity.get("type"):
-            activity["type"] = activity["type"].strip()
-    
     return jsonify({"activities": activities})
@@ -1,37 +1,316 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from bson import ObjectId, errors
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
+from functools import wraps
+import re
 import secrets
 import hashlib
-from app.extensions import db as mongo
+from app.extensions import db as mongo, executor, gateway_executor, run_in_transaction
+from app.utils.activity_log import log_activity
+from app.utils.ids import current_user_oid, to_object_id
+from app.utils.idempotency import idempotent
+from app.utils.ttl_cache import TTLCache
 from app.core import (
     JoinRequestService, RuleEnforcementService, ReliabilityService,
-    NotificationService, PoolService, WalletFallbackService
+    NotificationService, PoolService, WalletFallbackService, DebtService
 )
+from app.payments.models import PaymentIntentDB
+from app.payments.services.finternet import FinternetService
 
 events_bp = Blueprint("events", __name__)
 
 
 # ------------------ HELPERS ------------------
 
+_OBJECT_ID_HEX = re.compile(r"[0-9a-fA-F]{24}").fullmatch
+
+
 def safe_object_id(value):
-    try:
-        return ObjectId(value)
-    except errors.InvalidId:
+    """Parse a 24-char hex id, returning None for anything else."""
+    if isinstance(value, ObjectId):
+        return value
+    # Checking the format first avoids raising InvalidId for bad input,
+    # and stops ObjectId(None) from silently minting a fresh id
+    if not isinstance(value, str) or not _OBJECT_ID_HEX(value):
         return None
+    # Same ids recur across requests; reuse the memoized parse
+    return to_object_id(value)
+
+
+def resolve_ids(*names):
+    """
+    Parse the named URL id params into ObjectIds before the view runs.
+
+    Each <name>_id arrives as <name>_oid; a malformed one gets a 400
+    ("Invalid <name> ID") without entering the view.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            for name in names:
+                oid = safe_object_id(kwargs.pop(name))
+                label = name[:-len("_id")]
+                if oid is None:
+                    return jsonify({"error": f"Invalid {label} ID"}), 400
+                kwargs[label + "_oid"] = oid
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
 
 
 def is_participant(event_id, user_id):
+    # Projecting only indexed fields (and not _id) makes this a covered
+    # query on (event_id, user_id): answered from the index alone
     return mongo.participants.find_one({
         "event_id": event_id,
         "user_id": user_id
-    })
+    }, {"_id": 0, "event_id": 1}) is not None
+
+
+# Rule fields accepted by create_event and the value used when one is
+# omitted
+EVENT_RULE_DEFAULTS = {
+    # Spending limits
+    "spending_limit": None,
+    "max_expense_per_transaction": None,
+    "min_expense_per_transaction": None,
+    "max_cumulative_spend_per_user": None,
+
+    # Deposit limits
+    "min_deposit": None,
+    "max_deposit": None,
+    "deposit_margin_min": None,
+    "deposit_margin_max": None,
+
+    # Approval settings
+    "approval_required": False,
+    "auto_approve_under": 100,
+    "approval_required_threshold": None,
+    "warning_threshold": None,
+
+    # Category restrictions
+    "restricted_categories": [],
+    "blocked_categories": [],
+
+    # Other settings
+    "allow_wallet_fallback": True,
+    "max_debt_allowed": None,
+}
+
+# Upper-case letters and digits minus the look-alikes (I/L/O/U, 0/1), so
+# codes survive being read aloud or retyped and are always URL-safe
+INVITE_CODE_ALPHABET = "ABCDEFGHJKMNPQRSTVWXYZ23456789"
+INVITE_CODE_LENGTH = 8
+# Shape of every code ever issued, including older token_urlsafe ones
+_INVITE_CODE_SHAPE = re.compile(r"[A-Za-z0-9_-]{8}").fullmatch
+INVITE_CODE_ATTEMPTS = 5
+
+# Fields returned for each event in list views
+EVENT_LIST_FIELDS = {
+    "name": 1,
+    "description": 1,
+    "creator_id": 1,
+    "start_date": 1,
+    "end_date": 1,
+    "status": 1,
+    "invite_code": 1,
+    "invite_enabled": 1,
+    "total_pool": 1,
+    "total_spent": 1,
+    "created_at": 1
+}
+
+# Trims each listed event to EVENT_LIST_FIELDS and joins in its active
+# participant count, so the list needs no per-event queries
+EVENT_LIST_STAGES = (
+    {"$project": EVENT_LIST_FIELDS},
+    {"$lookup": {
+        "from": "participants",
+        "let": {"event_id": "$_id"},
+        "pipeline": [
+            {"$match": {
+                "$expr": {"$eq": ["$event_id", "$$event_id"]},
+                "status": "active"
+            }},
+            {"$count": "count"}
+        ],
+        "as": "participant_count"
+    }},
+    {"$set": {
+        "participant_count": {
+            "$ifNull": [{"$arrayElemAt": ["$participant_count.count", 0]}, 0]
+        }
+    }}
+)
+
+
+def user_event_stages(event_match):
+    """
+    Pipeline stages that turn a user's participant rows into the matching
+    event documents, optionally filtered by event_match.
+    """
+    stages = [
+        {"$lookup": {
+            "from": "events",
+            "localField": "event_id",
+            "foreignField": "_id",
+            "as": "event"
+        }},
+        {"$unwind": "$event"},
+        {"$replaceRoot": {"newRoot": "$event"}}
+    ]
+    if event_match:
+        stages.append({"$match": event_match})
+    return stages
+
+
+# Public invite previews, keyed by upper-cased invite code. Entries are
+# dropped whenever the code, status, owner or deposit rules of the event
+# change.
+_invite_cache = TTLCache(maxsize=10_000, ttl=30)
+
+INVITE_PREVIEW_FIELDS = {
+    "name": 1,
+    "description": 1,
+    "creator_id": 1,
+    "start_date": 1,
+    "end_date": 1,
+    "status": 1,
+    "rules.min_deposit": 1,
+    "rules.max_deposit": 1
+}
+
+
+def invalidate_invite_cache(event):
+    """Drop the cached invite preview for an event document."""
+    if event and event.get("invite_code"):
+        _invite_cache.pop(event["invite_code"])
+
+
+def invite_url(invite_code):
+    """Absolute API URL for joining via an invite code."""
+    return request.host_url + "api/v1/events/join/" + str(invite_code)
 
 
 def generate_invite_code():
     """Generate a unique 8-character invite code."""
-    return secrets.token_urlsafe(6)[:8].upper()
+    return "".join(secrets.choice(INVITE_CODE_ALPHABET) for _ in range(INVITE_CODE_LENGTH))
+
+
+def normalize_invite_code(value):
+    """
+    Canonical (upper-case) form of a user-supplied invite code, or None if
+    it can't be a code at all, so junk never costs a query.
+    """
+    if not _INVITE_CODE_SHAPE(value):
+        return None
+    return value.upper()
+
+
+def write_with_invite_code(write):
+    """
+    Call write(code) with fresh invite codes until one is accepted and
+    return its result.
+
+    Uniqueness is enforced by the unique index on events.invite_code, so
+    the common case is a single write with no lookup beforehand.
+    """
+    for attempt in range(INVITE_CODE_ATTEMPTS):
+        try:
+            return write(generate_invite_code())
+        except DuplicateKeyError as e:
+            # Only a clash on the code itself is worth retrying. Servers
+            # that don't report the key pattern get the benefit of the doubt.
+            key = (e.details or {}).get("keyPattern")
+            if (key is not None and "invite_code" not in key) or attempt == INVITE_CODE_ATTEMPTS - 1:
+                raise
+
+
+def apply_deposit(event_id, user_id, amount):
+    """
+    Credit a participant and the event pool atomically.
+
+    Returns False (and leaves the pool untouched) if the participant
+    no longer exists.
+    """
+    def credit(session):
+        result = mongo.participants.update_one(
+            {"event_id": event_id, "user_id": user_id},
+            {"$inc": {"deposit_amount": amount, "balance": amount}},
+            session=session
+        )
+        if result.matched_count == 0:
+            return False
+        mongo.events.update_one(
+            {"_id": event_id},
+            {"$inc": {"total_pool": amount}},
+            session=session
+        )
+        return True
+
+    return run_in_transaction(credit)
+
+
+def pair_filter(user_a, user_b):
+    """
+    Filter matching the friendship between two users, whichever of them
+    sent the request. One seek on the (pair_a, pair_b) index instead of an
+    $or over both directions.
+    """
+    pair_a, pair_b = sorted([user_a, user_b])
+    return {"pair_a": pair_a, "pair_b": pair_b}
+
+
+def stream_list(key, rows):
+    """
+    Respond with {key: [...rows]} written row by row from a cursor.
+
+    Only the current row is held in memory instead of the full list.
+    """
+    def generate():
+        yield '{"%s":[' % key
+        for i, row in enumerate(rows):
+            yield ("," if i else "") + current_app.json.dumps(row)
+        yield "]}"
+
+    return Response(stream_with_context(generate()), mimetype="application/json")
+
+
+EVENT_DATA_COLLECTIONS = ("expenses", "participants", "approval_requests", "activities")
+
+
+def delete_event_data(event):
+    """
+    Delete an event document and everything that belongs to it.
+
+    The per-collection deletes are independent, so they run concurrently;
+    the event itself goes last so a failure never leaves orphaned rows
+    behind a missing event.
+    """
+    event_oid = event["_id"]
+    futures = [
+        executor.submit(mongo[name].delete_many, {"event_id": event_oid})
+        for name in EVENT_DATA_COLLECTIONS
+    ]
+    for future in futures:
+        future.result()
+    mongo.events.delete_one({"_id": event_oid})
+    invalidate_invite_cache(event)
+
+
+def _log_orphaned_deposit_intent(future):
+    """Report a deposit intent created for an event whose insert failed."""
+    try:
+        _, intent_response = future.result()
+    except Exception as e:
+        print(f"Finternet error: {e}")
+        return
+    intent_data = intent_response.get("data", intent_response)
+    intent_id = intent_data.get("id") or intent_response.get("id")
+    print(f"[create_event] Payment intent {intent_id} was created for an event that failed to save")
 
 
 # ------------------ ROUTES ------------------
@@ -39,46 +318,19 @@ def generate_invite_code():
 @events_bp.route("/", methods=["POST"])
 @jwt_required()
 def create_event():
-    user_id = safe_object_id(get_jwt_identity())
+    user_id = current_user_oid()
     data = request.get_json()
 
     if not data or not data.get("name"):
         return jsonify({"error": "Event name is required"}), 400
 
-    invite_code = generate_invite_code()
-    
-    # Ensure unique invite code
-    while mongo.events.find_one({"invite_code": invite_code}):
-        invite_code = generate_invite_code()
+    now = datetime.utcnow()
 
     # Parse rules with all options
     rules_data = data.get("rules", {})
     event_rules = {
-        # Spending limits
-        "spending_limit": rules_data.get("spending_limit"),
-        "max_expense_per_transaction": rules_data.get("max_expense_per_transaction"),
-        "min_expense_per_transaction": rules_data.get("min_expense_per_transaction"),
-        "max_cumulative_spend_per_user": rules_data.get("max_cumulative_spend_per_user"),
-        
-        # Deposit limits
-        "min_deposit": rules_data.get("min_deposit"),
-        "max_deposit": rules_data.get("max_deposit"),
-        "deposit_margin_min": rules_data.get("deposit_margin_min"),
-        "deposit_margin_max": rules_data.get("deposit_margin_max"),
-        
-        # Approval settings
-        "approval_required": rules_data.get("approval_required", False),
-        "auto_approve_under": rules_data.get("auto_approve_under", 100),
-        "approval_required_threshold": rules_data.get("approval_required_threshold"),
-        "warning_threshold": rules_data.get("warning_threshold"),
-        
-        # Category restrictions
-        "restricted_categories": rules_data.get("restricted_categories", []),
-        "blocked_categories": rules_data.get("blocked_categories", []),
-        
-        # Other settings
-        "allow_wallet_fallback": rules_data.get("allow_wallet_fallback", True),
-        "max_debt_allowed": rules_data.get("max_debt_allowed"),
+        key: rules_data.get(key, list(default) if isinstance(default, list) else default)
+        for key, default in EVENT_RULE_DEFAULTS.items()
     }
 
     event = {
@@ -88,15 +340,15 @@ def create_event():
         "start_date": data.get("start_date"),
         "end_date": data.get("end_date"),
         "status": "active",
-        "invite_code": invite_code,
+        "invite_code": None,
         "invite_enabled": True,
         "shared_wallet_id": None,
         "merkle_root": None,
         "rules": event_rules,
         "total_pool": 0,
         "total_spent": 0,
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow()
+        "created_at": now,
+        "updated_at": now
     }
 
     # Validate creator's initial deposit if deposit rules are set
@@ -118,8 +370,9 @@ def create_event():
     
     creator_deposit = float(creator_deposit) if creator_deposit else 0
     
-    result = mongo.events.insert_one(event)
-    event_id = result.inserted_id
+    # Generate the id client-side so the wallet debit can reference the
+    # event before it is written
+    event_id = ObjectId()
 
     # Check if user wants to pay deposit from wallet
     use_wallet = data.get("use_wallet", False)
@@ -138,31 +391,19 @@ def create_event():
         
         if success:
             wallet_deducted = True
-            # Credit the event pool and participant balance immediately
-            mongo.participants.insert_one({
-                "event_id": event_id,
-                "user_id": user_id,
-                "deposit_amount": creator_deposit,
-                "total_spent": 0,
-                "balance": creator_deposit,
-                "status": "active",
-                "categories": [],
-                "created_at": datetime.utcnow()
-            })
-            
-            # Update event total pool
-            mongo.events.update_one(
-                {"_id": event_id},
-                {"$inc": {"total_pool": creator_deposit}}
-            )
         else:
             wallet_error = error
             # Fall through to payment gateway if wallet fails
             use_wallet = False
 
-    # Add creator as participant if not already added (wallet deduction path)
-    if not wallet_deducted:
-        initial_deposit_recorded = 0.0 if creator_deposit > 0 else creator_deposit
+    # A wallet deposit credits the pool and creator balance immediately;
+    # a gateway deposit is only recorded once the payment is confirmed
+    initial_deposit_recorded = creator_deposit if wallet_deducted else 0.0
+    event["_id"] = event_id
+    event["total_pool"] = initial_deposit_recorded
+
+    def insert_event(session):
+        mongo.events.insert_one(event, session=session)
         mongo.participants.insert_one({
             "event_id": event_id,
             "user_id": user_id,
@@ -171,16 +412,59 @@ def create_event():
             "balance": initial_deposit_recorded,
             "status": "active",
             "categories": [],
-            "created_at": datetime.utcnow()
-        })
+            "created_at": now
+        }, session=session)
+
+    def insert_with_code(code):
+        event["invite_code"] = code
+        run_in_transaction(insert_event)
+        return code
 
-    event["_id"] = str(event_id)
-    event["creator_id"] = str(event["creator_id"])
+    def create_deposit_intent():
+        finternet = FinternetService()
+        intent_response = finternet.create_payment_intent(
+            amount=creator_deposit,
+            currency="USD",
+            description=f"Event deposit for: {event['name']}",
+            metadata={
+                "type": "event_deposit",
+                "event_id": str(event_id),
+                "user_id": str(user_id),
+                "deposit_type": "creator"
+            }
+        )
+        return finternet, intent_response
+
+    # The payment intent only needs the pre-generated event id, so the
+    # gateway call runs while the event is being written
+    intent_future = None
+    if creator_deposit > 0 and not wallet_deducted:
+        intent_future = gateway_executor.submit(create_deposit_intent)
+
+    # Event and creator participant are written atomically
+    try:
+        invite_code = write_with_invite_code(insert_with_code)
+    except Exception:
+        # The wallet was debited for an event that was never stored
+        if wallet_deducted:
+            WalletFallbackService.credit_wallet(
+                user_id=str(user_id),
+                amount=creator_deposit,
+                source="event_deposit_refund",
+                reference_id=str(event_id),
+                notes=f"Refund: event '{data['name']}' could not be created"
+            )
+        # Drop the intent if it hasn't started, otherwise report it once it
+        # returns since it points at an event that doesn't exist
+        if intent_future is not None and not intent_future.cancel():
+            intent_future.add_done_callback(_log_orphaned_deposit_intent)
+        raise
+
+    # ObjectIds are stringified by the app's JSON provider
     event["creator_deposit"] = creator_deposit
 
     # Include invite link in response
-    base_url = request.host_url.rstrip("/")
-    event["invite_url"] = f"{base_url}/api/v1/events/join/{invite_code}"
+    event["invite_url"] = invite_url(invite_code)
 
     payment_url = None
     
@@ -195,21 +479,9 @@ def create_event():
     if wallet_error:
         event["wallet_error"] = wallet_error
     
-    if creator_deposit > 0:
+    if intent_future is not None:
         try:
-            from app.payments.services.finternet import FinternetService
-            finternet = FinternetService()
-            intent_response = finternet.create_payment_intent(
-                amount=creator_deposit,
-                currency="USD",
-                description=f"Event deposit for: {event['name']}",
-                metadata={
-                    "type": "event_deposit",
-                    "event_id": str(event_id),
-                    "user_id": str(user_id),
-                    "deposit_type": "creator"
-                }
-            )
+            finternet, intent_response = intent_future.result()
 
             intent_data = intent_response.get("data", intent_response)
             intent_id = intent_data.get("id") or intent_response.get("id")
@@ -217,12 +489,12 @@ def create_event():
             # Store pending event deposit
             mongo.event_deposits.insert_one({
                 "event_id": event_id,
-                "user_id": ObjectId(user_id),
+                "user_id": user_id,
                 "intent_id": intent_id,
                 "amount": creator_deposit,
                 "status": "pending",
                 "deposit_type": "creator",
-                "created_at": datetime.utcnow()
+                "created_at": now
             })
 
             payment_url = finternet.get_payment_url(intent_response)
@@ -247,8 +519,10 @@ def get_user_events():
     - sort: Sort field (default: created_at)
     - order: Sort order (asc/desc, default: desc)
     - status: Filter by status (active/completed/cancelled)
+    - cursor: Use keyset pagination instead of page/sort; pass empty for
+      the first page, then the previous response's next_cursor
     """
-    user_id = safe_object_id(get_jwt_identity())
+    user_id = current_user_oid()
     
     # Pagination params
     page = max(1, int(request.args.get("page", 1)))
@@ -257,59 +531,66 @@ def get_user_events():
     sort_order = -1 if request.args.get("order", "desc") == "desc" else 1
     status_filter = request.args.get("status")
     
-    # Get participant events
-    participant_events = list(mongo.participants.find({"user_id": user_id}))
-    event_ids = [p["event_id"] for p in participant_events]
-    
-    if not event_ids:
+    # Walk the user's participant rows and join each to its event on the
+    # server, so the event ids never have to round-trip through Python
+    participant_match = {"user_id": user_id}
+    event_match = {"status": status_filter} if status_filter else {}
+    
+    # Cursor mode: keyset pagination on the event id, newest first. Avoids
+    # both the count and an ever-growing $skip for users with long event
+    # histories, and walks the participants (user_id, event_id) index.
+    if "cursor" in request.args:
+        cursor = request.args.get("cursor")
+        if cursor:
+            cursor_oid = safe_object_id(cursor)
+            if not cursor_oid:
+                return jsonify({"error": "Invalid cursor"}), 400
+            participant_match["event_id"] = {"$lt": cursor_oid}
+        
+        events = list(mongo.participants.aggregate([
+            {"$match": participant_match},
+            {"$sort": {"event_id": -1}},
+            *user_event_stages(event_match),
+            {"$limit": limit},
+            *EVENT_LIST_STAGES
+        ]))
+        has_next = len(events) == limit
+        
         return jsonify({
-            "events": [],
+            "events": events,
             "pagination": {
-                "page": page,
                 "limit": limit,
-                "total": 0,
-                "total_pages": 0,
-                "has_next": False,
-                "has_prev": False
+                "has_next": has_next,
+                "next_cursor": events[-1]["_id"] if has_next else None
             }
         })
     
-    # Build query
-    query = {"_id": {"$in": event_ids}}
-    if status_filter:
-        query["status"] = status_filter
-    
-    # Get total count
-    total = mongo.events.count_documents(query)
-    total_pages = (total + limit - 1) // limit
-    
     # Validate sort field
     allowed_sort_fields = ["created_at", "name", "total_pool", "total_spent", "status"]
     if sort_field not in allowed_sort_fields:
         sort_field = "created_at"
     
-    # Get paginated events
+    # Count and fetch the page in the same round trip
     skip = (page - 1) * limit
-    events = list(mongo.events.find(query)
-                  .sort(sort_field, sort_order)
-                  .skip(skip)
-                  .limit(limit))
-    
-    # Format response
-    response = []
-    for event in events:
-        event["_id"] = str(event["_id"])
-        event["creator_id"] = str(event["creator_id"])
-        # Include participant count
-        participant_count = mongo.participants.count_documents({
-            "event_id": ObjectId(event["_id"]),
-            "status": "active"
-        })
-        event["participant_count"] = participant_count
-        response.append(event)
+    result = next(mongo.participants.aggregate([
+        {"$match": participant_match},
+        *user_event_stages(event_match),
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "events": [
+                {"$sort": {sort_field: sort_order}},
+                {"$skip": skip},
+                {"$limit": limit},
+                *EVENT_LIST_STAGES
+            ]
+        }}
+    ]))
+    events = result["events"]
+    total = result["total"][0]["count"] if result["total"] else 0
+    total_pages = (total + limit - 1) // limit
 
     return jsonify({
-        "events": response,
+        "events": events,
         "pagination": {
             "page": page,
             "limit": limit,
@@ -323,79 +604,148 @@ def get_user_events():
 
 @events_bp.route("/<event_id>", methods=["GET"])
 @jwt_required()
-def get_event(event_id):
-    event_oid = safe_object_id(event_id)
-    user_id = safe_object_id(get_jwt_identity())
-
-    if not event_oid:
-        return jsonify({"error": "Invalid event ID"}), 400
-
+@resolve_ids("event_id")
+def get_event(event_oid):
+    """
+    Get an event.
+    
+    Query params:
+    - include: Comma-separated extras; "participants" embeds the participant
+      list, otherwise only participant_count is returned
+    - limit: With include=participants, page the list to this many rows
+      (max 200); next_participant_cursor is set when more remain
+    - after: With include=participants, the previous next_participant_cursor
+    """
+    user_id = current_user_oid()
+
+    include = request.args.get("include", "").split(",")
+
+    if "participants" not in include:
+        # Event, membership and participant count in one round trip
+        event = next(mongo.events.aggregate([
+            {"$match": {"_id": event_oid}},
+            # The ids are known up front, so both lookups are plain index
+            # reads that return a count and at most one row, never the
+            # participant documents themselves
+            {"$lookup": {
+                "from": "participants",
+                "pipeline": [
+                    {"$match": {"event_id": event_oid, "status": "active"}},
+                    {"$count": "count"}
+                ],
+                "as": "participant_count"
+            }},
+            {"$lookup": {
+                "from": "participants",
+                "pipeline": [
+                    {"$match": {"event_id": event_oid, "user_id": user_id}},
+                    {"$limit": 1},
+                    {"$project": {"_id": 0, "event_id": 1}}
+                ],
+                "as": "membership"
+            }},
+            {"$addFields": {
+                "participant_count": {
+                    "$ifNull": [{"$arrayElemAt": ["$participant_count.count", 0]}, 0]
+                },
+                "is_participant": {"$gt": [{"$size": "$membership"}, 0]}
+            }},
+            {"$project": {"membership": 0}}
+        ]), None)
+        if not event:
+            return jsonify({"error": "Event not found"}), 404
+        if not event.pop("is_participant"):
+            return jsonify({"error": "Unauthorized"}), 403
+        return jsonify({"event": event})
+
+    # The membership check doesn't depend on the event, so overlap the two
+    participant_future = executor.submit(is_participant, event_oid, user_id)
     event = mongo.events.find_one({"_id": event_oid})
+    participant = participant_future.result()
     if not event:
         return jsonify({"error": "Event not found"}), 404
 
-    if not is_participant(event_oid, user_id):
+    if not participant:
         return jsonify({"error": "Unauthorized"}), 403
 
-    event["_id"] = str(event["_id"])
-    event["creator_id"] = str(event["creator_id"])
-
-    participants = mongo.participants.find({"event_id": event_oid})
-    participant_list = []
-
-    for p in participants:
-        user = mongo.users.find_one({"_id": p["user_id"]})
-        participant_list.append({
-            "_id": str(p["_id"]),
-            "user_id": str(p["user_id"]),
-            "user_name": user["name"] if user else "Unknown",
-            "deposit_amount": p["deposit_amount"],
-            "total_spent": p["total_spent"],
-            "balance": p["balance"],
-            "status": p["status"]
-        })
+    match = {"event_id": event_oid}
+    page = []
+    limit = request.args.get("limit", type=int)
+    if limit:
+        limit = min(200, max(1, limit))
+        after = request.args.get("after")
+        if after:
+            after_oid = safe_object_id(after)
+            if not after_oid:
+                return jsonify({"error": "Invalid cursor"}), 400
+            match["_id"] = {"$gt": after_oid}
+        page = [{"$sort": {"_id": 1}}, {"$limit": limit}]
+
+    # Join user names in the same round-trip instead of one lookup per participant
+    participant_list = list(mongo.participants.aggregate([
+        {"$match": match},
+        *page,
+        {"$lookup": {
+            "from": "users",
+            "localField": "user_id",
+            "foreignField": "_id",
+            "as": "user"
+        }},
+        {"$project": {
+            "_id": {"$toString": "$_id"},
+            "user_id": {"$toString": "$user_id"},
+            "user_name": {"$ifNull": [{"$arrayElemAt": ["$user.name", 0]}, "Unknown"]},
+            "deposit_amount": 1,
+            "total_spent": 1,
+            "balance": 1,
+            "status": 1
+        }}
+    ]))
 
     event["participants"] = participant_list
+    if limit:
+        event["next_participant_cursor"] = (
+            participant_list[-1]["_id"] if len(participant_list) == limit else None
+        )
 
     return jsonify({"event": event})
 
 
 @events_bp.route("/<event_id>/join", methods=["POST"])
 @jwt_required()
-def join_event(event_id):
-    event_oid = safe_object_id(event_id)
-    user_id = safe_object_id(get_jwt_identity())
+@resolve_ids("event_id")
+def join_event(event_oid):
+    user_id = current_user_oid()
 
-    if not event_oid:
-        return jsonify({"error": "Invalid event ID"}), 400
-
-    event = mongo.events.find_one({"_id": event_oid})
+    event = mongo.events.find_one({"_id": event_oid}, {"status": 1})
     if not event:
         return jsonify({"error": "Event not found"}), 404
 
     if event["status"] != "active":
         return jsonify({"error": "Event is not active"}), 400
 
-    if is_participant(event_oid, user_id):
+    # The unique (user_id, event_id) index rejects a second join
+    try:
+        mongo.participants.insert_one({
+            "event_id": event_oid,
+            "user_id": user_id,
+            "deposit_amount": 0,
+            "total_spent": 0,
+            "balance": 0,
+            "status": "active",
+            "categories": [],
+            "created_at": datetime.utcnow()
+        })
+    except DuplicateKeyError:
         return jsonify({"error": "Already a participant"}), 409
 
-    mongo.participants.insert_one({
-        "event_id": event_oid,
-        "user_id": user_id,
-        "deposit_amount": 0,
-        "total_spent": 0,
-        "balance": 0,
-        "status": "active",
-        "categories": [],
-        "created_at": datetime.utcnow()
-    })
-
     return jsonify({"message": "Joined event successfully"}), 201
 
 
 @events_bp.route("/<event_id>/leave", methods=["POST"])
 @jwt_required()
-def leave_event(event_id):
+@resolve_ids("event_id")
+def leave_event(event_oid):
     """
     Leave an event and withdraw your remaining balance.
     
@@ -403,15 +753,9 @@ def leave_event(event_id):
     Cannot leave if you have outstanding debts to settle.
     Creator cannot leave their own event.
     """
-    from app.core import DebtService
-    
-    event_oid = safe_object_id(event_id)
-    user_id = safe_object_id(get_jwt_identity())
-
-    if not event_oid:
-        return jsonify({"error": "Invalid event ID"}), 400
+    user_id = current_user_oid()
 
-    event = mongo.events.find_one({"_id": event_oid})
+    event = mongo.events.find_one({"_id": event_oid}, {"creator_id": 1, "name": 1, "invite_code": 1})
     if not event:
         return jsonify({"error": "Event not found"}), 404
 
@@ -423,7 +767,7 @@ def leave_event(event_id):
     participant = mongo.participants.find_one({
         "event_id": event_oid,
         "user_id": user_id
-    })
+    }, {"_id": 1})
     
     if not participant:
         return jsonify({"error": "You are not a participant of this event"}), 404
@@ -439,22 +783,39 @@ def leave_event(event_id):
             "outstanding_debts": debts
         }), 400
     
-    # Get the user's current balance
-    user_balance = round(float(participant.get("balance", 0)), 2)
+    now = datetime.utcnow()
+
+    def withdraw(session):
+        # Deleting the row is what claims the balance: a concurrent leave
+        # for the same user finds nothing here and backs off, so the pool
+        # is only ever drawn down once
+        claimed = mongo.participants.find_one_and_delete(
+            {"_id": participant["_id"]},
+            projection={"balance": 1},
+            session=session
+        )
+        if claimed is None:
+            return None
+        balance = round(float(claimed.get("balance", 0)), 2)
+        if balance > 0:
+            mongo.events.update_one(
+                {"_id": event_oid},
+                {
+                    "$inc": {"total_pool": -balance},
+                    "$set": {"updated_at": now}
+                },
+                session=session
+            )
+        return balance
+
+    # Remove the participant record and take their balance out of the pool
+    user_balance = run_in_transaction(withdraw)
+    if user_balance is None:
+        return jsonify({"error": "You are not a participant of this event"}), 404
     
     # Only process if there's a positive balance to return
     if user_balance > 0:
-        # Subtract from event pool
-        mongo.events.update_one(
-            {"_id": event_oid},
-            {
-                "$inc": {"total_pool": -user_balance},
-                "$set": {"updated_at": datetime.utcnow()}
-            }
-        )
-        
         # Credit the user's personal wallet
-        from app.core import WalletFallbackService
         WalletFallbackService.credit_wallet(
             user_id=str(user_id),
             amount=user_balance,
@@ -470,41 +831,38 @@ def leave_event(event_id):
             "user_id": user_id,
             "amount": user_balance,
             "description": f"Left event and withdrew ${user_balance:.2f} to wallet",
-            "created_at": datetime.utcnow()
+            "created_at": now
         })
     
-    # Remove the participant record
-    mongo.participants.delete_one({"_id": participant["_id"]})
-    
     # Get user info for notification
-    user = mongo.users.find_one({"_id": user_id})
+    user = mongo.users.find_one({"_id": user_id}, {"name": 1})
     user_name = user.get("name", "A participant") if user else "A participant"
     
-    # Notify event creator
-    from app.core import NotificationService
-    NotificationService.create_notification(
-        user_id=str(event["creator_id"]),
-        notification_type="participant_left",
-        title="Participant Left",
-        message=f"{user_name} has left the event '{event['name']}'" + 
-                (f" and withdrew ${user_balance:.2f}" if user_balance > 0 else ""),
-        data={
+    # Notify event creator off the request thread
+    NotificationService.create_notifications_later([{
+        "user_id": str(event["creator_id"]),
+        "notification_type": "participant_left",
+        "title": "Participant Left",
+        "message": f"{user_name} has left the event '{event['name']}'" + 
+                   (f" and withdrew ${user_balance:.2f}" if user_balance > 0 else ""),
+        "data": {
             "event_id": str(event_oid),
             "left_user_id": str(user_id),
             "amount_withdrawn": user_balance
         }
-    )
-    
-    # Check if event is now empty (no participants left)
-    remaining_participants = mongo.participants.count_documents({"event_id": event_oid})
+    }])
+    
+    # Check if event is now empty (no participants left); stops at the
+    # first index entry instead of counting them all
+    has_participants = mongo.participants.find_one(
+        {"event_id": event_oid},
+        {"_id": 0, "event_id": 1}
+    ) is not None
     event_deleted = False
     
-    if remaining_participants == 0:
+    if not has_participants:
         # Delete the event and all related data
-        mongo.expenses.delete_many({"event_id": event_oid})
-        mongo.approval_requests.delete_many({"event_id": event_oid})
-        mongo.activities.delete_many({"event_id": event_oid})
-        mongo.events.delete_one({"_id": event_oid})
+        delete_event_data(event)
         event_deleted = True
     
     return jsonify({
@@ -517,22 +875,18 @@ def leave_event(event_id):
 
 @events_bp.route("/<event_id>", methods=["DELETE"])
 @jwt_required()
-def delete_event(event_id):
+@resolve_ids("event_id")
+def delete_event(event_oid):
     """
     Delete an event (creator only).
     
     This permanently deletes the event and all related data.
     All participant balances are returned to them.
     """
-    from app.core import NotificationService
     
-    event_oid = safe_object_id(event_id)
-    user_id = safe_object_id(get_jwt_identity())
+    user_id = current_user_oid()
 
-    if not event_oid:
-        return jsonify({"error": "Invalid event ID"}), 400
-
-    event = mongo.events.find_one({"_id": event_oid})
+    event = mongo.events.find_one({"_id": event_oid}, {"creator_id": 1, "name": 1, "invite_code": 1})
     if not event:
         return jsonify({"error": "Event not found"}), 404
 
@@ -541,47 +895,47 @@ def delete_event(event_id):
         return jsonify({"error": "Only the event creator can delete this event"}), 403
     
     # Get all participants to notify them
-    participants = list(mongo.participants.find({"event_id": event_oid}))
+    participants = list(mongo.participants.find(
+        {"event_id": event_oid},
+        {"user_id": 1, "balance": 1}
+    ))
     event_name = event.get("name", "Unknown Event")
     
-    # Import wallet service for crediting balances
-    from app.core import WalletFallbackService
-    
     # Notify all participants (except creator) about deletion and credit their wallets
+    credits = []
+    notifications = []
     for participant in participants:
         balance = round(float(participant.get("balance", 0)), 2)
         
-        # Credit positive balance to user's personal wallet
+        # Positive balances go back to each user's personal wallet
         if balance > 0:
-            WalletFallbackService.credit_wallet(
-                user_id=str(participant["user_id"]),
-                amount=balance,
-                source="event_deleted",
-                reference_id=str(event_oid),
-                notes=f"Event '{event_name}' deleted - balance returned"
-            )
+            credits.append((str(participant["user_id"]), balance))
         
         if participant["user_id"] != user_id:
-            NotificationService.create_notification(
-                user_id=str(participant["user_id"]),
-                notification_type="event_deleted",
-                title="Event Deleted",
-                message=f"The event '{event_name}' has been deleted by the creator." +
-                        (f" Your balance of ${balance:.2f} has been credited to your wallet." if balance > 0 else ""),
-                data={
+            notifications.append({
+                "user_id": str(participant["user_id"]),
+                "notification_type": "event_deleted",
+                "title": "Event Deleted",
+                "message": f"The event '{event_name}' has been deleted by the creator." +
+                           (f" Your balance of ${balance:.2f} has been credited to your wallet." if balance > 0 else ""),
+                "data": {
                     "event_id": str(event_oid),
                     "event_name": event_name,
                     "balance_returned": balance,
                     "balance_credited_to_wallet": balance > 0
                 }
-            )
+            })
+    
+    WalletFallbackService.credit_wallets(
+        credits,
+        source="event_deleted",
+        reference_id=str(event_oid),
+        notes=f"Event '{event_name}' deleted - balance returned"
+    )
+    NotificationService.create_notifications_later(notifications)
     
     # Delete all related data
-    mongo.expenses.delete_many({"event_id": event_oid})
-    mongo.participants.delete_many({"event_id": event_oid})
-    mongo.approval_requests.delete_many({"event_id": event_oid})
-    mongo.activities.delete_many({"event_id": event_oid})
-    mongo.events.delete_one({"_id": event_oid})
+    delete_event_data(event)
     
     return jsonify({
         "message": "Event deleted successfully",
@@ -592,7 +946,8 @@ def delete_event(event_id):
 
 @events_bp.route("/<event_id>/end", methods=["POST"])
 @jwt_required()
-def end_event(event_id):
+@resolve_ids("event_id")
+def end_event(event_oid):
     """
     End an event and distribute remaining balances to all participants.
     
@@ -600,15 +955,13 @@ def end_event(event_id):
     Each participant's positive balance is returned to them.
     The event is marked as 'completed'.
     """
-    from app.core import NotificationService
     
-    event_oid = safe_object_id(event_id)
-    user_id = safe_object_id(get_jwt_identity())
+    user_id = current_user_oid()
 
-    if not event_oid:
-        return jsonify({"error": "Invalid event ID"}), 400
-
-    event = mongo.events.find_one({"_id": event_oid})
+    event = mongo.events.find_one({"_id": event_oid}, {
+        "creator_id": 1, "name": 1, "status": 1, "invite_code": 1,
+        "total_pool": 1, "total_spent": 1
+    })
     if not event:
         return jsonify({"error": "Event not found"}), 404
 
@@ -621,30 +974,34 @@ def end_event(event_id):
         return jsonify({"error": "Event is already ended"}), 400
     
     # Get all participants
-    participants = list(mongo.participants.find({"event_id": event_oid}))
+    participants = list(mongo.participants.find(
+        {"event_id": event_oid},
+        {"user_id": 1, "balance": 1, "deposit_amount": 1, "total_spent": 1}
+    ))
     event_name = event.get("name", "Unknown Event")
     
-    # Import wallet service for crediting balances
-    from app.core import WalletFallbackService
+    # Fetch every participant's name in one query
+    user_names = {
+        u["_id"]: u.get("name", "Unknown")
+        for u in mongo.users.find(
+            {"_id": {"$in": [p["user_id"] for p in participants]}},
+            {"name": 1}
+        )
+    }
     
     # Calculate settlement for each participant and credit their wallet
     settlements = []
+    credits = []
+    notifications = []
     for participant in participants:
-        user = mongo.users.find_one({"_id": participant["user_id"]})
-        user_name = user.get("name", "Unknown") if user else "Unknown"
+        user_name = user_names.get(participant["user_id"], "Unknown")
         balance = round(float(participant.get("balance", 0)), 2)
         deposit = round(float(participant.get("deposit_amount", 0)), 2)
         spent = round(float(participant.get("total_spent", 0)), 2)
         
-        # Credit positive balance to user's personal wallet
+        # Positive balances go back to each user's personal wallet
         if balance > 0:
-            WalletFallbackService.credit_wallet(
-                user_id=str(participant["user_id"]),
-                amount=balance,
-                source="event_settlement",
-                reference_id=str(event_oid),
-                notes=f"Event '{event_name}' ended - balance returned"
-            )
+            credits.append((str(participant["user_id"]), balance))
         
         settlements.append({
             "user_id": str(participant["user_id"]),
@@ -664,12 +1021,12 @@ def end_event(event_id):
             else:
                 message = f"Event '{event_name}' has ended. Your balance was $0.00."
             
-            NotificationService.create_notification(
-                user_id=str(participant["user_id"]),
-                notification_type="event_ended",
-                title="Event Ended",
-                message=message,
-                data={
+            notifications.append({
+                "user_id": str(participant["user_id"]),
+                "notification_type": "event_ended",
+                "title": "Event Ended",
+                "message": message,
+                "data": {
                     "event_id": str(event_oid),
                     "event_name": event_name,
                     "balance_returned": balance,
@@ -677,30 +1034,40 @@ def end_event(event_id):
                     "deposit_amount": deposit,
                     "total_spent": spent
                 }
-            )
+            })
+    
+    WalletFallbackService.credit_wallets(
+        credits,
+        source="event_settlement",
+        reference_id=str(event_oid),
+        notes=f"Event '{event_name}' ended - balance returned"
+    )
+    NotificationService.create_notifications_later(notifications)
     
     # Mark event as completed
+    now = datetime.utcnow()
     mongo.events.update_one(
         {"_id": event_oid},
         {
             "$set": {
                 "status": "completed",
-                "ended_at": datetime.utcnow(),
+                "ended_at": now,
                 "ended_by": user_id,
                 "final_settlements": settlements,
-                "updated_at": datetime.utcnow()
+                "updated_at": now
             }
         }
     )
+    invalidate_invite_cache(event)
     
     # Record activity
-    mongo.activities.insert_one({
+    log_activity({
         "type": "event_ended",
         "event_id": event_oid,
         "user_id": user_id,
         "description": f"Event '{event_name}' ended by creator",
         "settlements": settlements,
-        "created_at": datetime.utcnow()
+        "created_at": now
     })
     
     return jsonify({
@@ -716,22 +1083,18 @@ def end_event(event_id):
 
 @events_bp.route("/<event_id>/transfer-ownership", methods=["POST"])
 @jwt_required()
-def transfer_ownership(event_id):
+@resolve_ids("event_id")
+def transfer_ownership(event_oid):
     """
     Transfer event ownership to another participant.
     
     Only the current creator can transfer ownership.
     The new owner must be an active participant.
     """
-    from app.core import NotificationService
     
-    event_oid = safe_object_id(event_id)
-    user_id = safe_object_id(get_jwt_identity())
+    user_id = current_user_oid()
     data = request.get_json()
     
-    if not event_oid:
-        return jsonify({"error": "Invalid event ID"}), 400
-    
     new_owner_id = data.get("new_owner_id")
     if not new_owner_id:
         return jsonify({"error": "New owner ID is required"}), 400
@@ -740,7 +1103,7 @@ def transfer_ownership(event_id):
     if not new_owner_oid:
         return jsonify({"error": "Invalid new owner ID"}), 400
     
-    event = mongo.events.find_one({"_id": event_oid})
+    event = mongo.events.find_one({"_id": event_oid}, {"creator_id": 1, "name": 1, "invite_code": 1})
     if not event:
         return jsonify({"error": "Event not found"}), 404
     
@@ -757,31 +1120,34 @@ def transfer_ownership(event_id):
         "event_id": event_oid,
         "user_id": new_owner_oid,
         "status": {"$in": ["active", "approved"]}
-    })
+    }, {"_id": 1})
     
     if not new_owner_participant:
         return jsonify({"error": "New owner must be an active participant of this event"}), 400
     
-    # Get user info
-    current_owner = mongo.users.find_one({"_id": user_id})
-    new_owner = mongo.users.find_one({"_id": new_owner_oid})
-    
-    current_owner_name = current_owner.get("name", "Previous owner") if current_owner else "Previous owner"
-    new_owner_name = new_owner.get("name", "New owner") if new_owner else "New owner"
+    # Get both owners' names in one query
+    names = {
+        u["_id"]: u.get("name")
+        for u in mongo.users.find({"_id": {"$in": [user_id, new_owner_oid]}}, {"name": 1})
+    }
+    current_owner_name = names.get(user_id) or "Previous owner"
+    new_owner_name = names.get(new_owner_oid) or "New owner"
     
     # Update event creator
+    now = datetime.utcnow()
     mongo.events.update_one(
         {"_id": event_oid},
         {
             "$set": {
                 "creator_id": new_owner_oid,
-                "updated_at": datetime.utcnow()
+                "updated_at": now
             }
         }
     )
+    invalidate_invite_cache(event)
     
     # Record activity
-    mongo.activities.insert_one({
+    log_activity({
         "type": "ownership_transferred",
         "event_id": event_oid,
         "user_id": user_id,
@@ -790,20 +1156,20 @@ def transfer_ownership(event_id):
             "previous_owner_id": str(user_id),
             "new_owner_id": str(new_owner_oid)
         },
-        "created_at": datetime.utcnow()
+        "created_at": now
     })
     
-    # Notify new owner
-    NotificationService.create_notification(
-        user_id=str(new_owner_oid),
-        notification_type="ownership_received",
-        title="You are now the event owner",
-        message=f"{current_owner_name} has transferred ownership of '{event['name']}' to you.",
-        data={
+    # Notify new owner off the request thread
+    NotificationService.create_notifications_later([{
+        "user_id": str(new_owner_oid),
+        "notification_type": "ownership_received",
+        "title": "You are now the event owner",
+        "message": f"{current_owner_name} has transferred ownership of '{event['name']}' to you.",
+        "data": {
             "event_id": str(event_oid),
             "previous_owner_id": str(user_id)
         }
-    )
+    }])
     
     return jsonify({
         "message": f"Ownership transferred to {new_owner_name}",
@@ -817,7 +1183,15 @@ def transfer_ownership(event_id):
 @events_bp.route("/join/<invite_code>", methods=["GET"])
 def get_event_by_invite_code(invite_code):
     """Get event info by invite code (public - no auth required for preview)."""
-    event = mongo.events.find_one({"invite_code": invite_code.upper()})
+    code = normalize_invite_code(invite_code)
+    if not code:
+        return jsonify({"error": "Invalid invite code"}), 404
+    
+    event = _invite_cache.get(code)
+    if event is None:
+        event = mongo.events.find_one({"invite_code": code}, INVITE_PREVIEW_FIELDS)
+        if event:
+            _invite_cache.set(code, event)
     
     if not event:
         return jsonify({"error": "Invalid invite code"}), 404
@@ -830,8 +1204,11 @@ def get_event_by_invite_code(invite_code):
         return jsonify({"error": "Event is no longer active"}), 400
     
     # Return limited info for preview including deposit requirements
-    participant_count = mongo.participants.count_documents({"event_id": event["_id"]})
-    creator = mongo.users.find_one({"_id": event["creator_id"]})
+    count_future = executor.submit(
+        mongo.participants.count_documents, {"event_id": event["_id"], "status": "active"}
+    )
+    creator = mongo.users.find_one({"_id": event["creator_id"]}, {"name": 1})
+    participant_count = count_future.result()
     rules = event.get("rules", {})
     
     return jsonify({
@@ -858,7 +1235,14 @@ def join_event_by_code(invite_code):
     user_id = str(get_jwt_identity())
     data = request.get_json() or {}
     
-    event = mongo.events.find_one({"invite_code": invite_code.upper()})
+    code = normalize_invite_code(invite_code)
+    if not code:
+        return jsonify({"error": "Invalid invite code"}), 404
+    
+    event = mongo.events.find_one(
+        {"invite_code": code},
+        {"status": 1, "creator_id": 1, "name": 1, "rules": 1}
+    )
     
     if not event:
         return jsonify({"error": "Invalid invite code"}), 404
@@ -956,12 +1340,13 @@ def join_event_by_code(invite_code):
         }), 202
     
     # Direct join (no approval needed)
-    # If a deposit is required we create the participant record with zero
-    # recorded deposit/balance and create a pending event_deposits entry and
-    # a Finternet payment intent. The actual credit will happen on payment
-    # confirmation. If no deposit is required we record normally.
-    if deposit_amount > 0:
-        # create participant with zero balance until payment confirmed
+    # The participant is always recorded first with zero deposit/balance;
+    # the unique (user_id, event_id) index catches a concurrent second join
+    # that got past the is_participant check above. If a deposit is required
+    # a pending event_deposits entry and a Finternet payment intent follow,
+    # and the actual credit happens on payment confirmation.
+    now = datetime.utcnow()
+    try:
         mongo.participants.insert_one({
             "event_id": event["_id"],
             "user_id": safe_object_id(user_id),
@@ -971,13 +1356,15 @@ def join_event_by_code(invite_code):
             "status": "active",
             "categories": [],
             "joined_via": "invite_code",
-            "created_at": datetime.utcnow()
+            "created_at": now
         })
+    except DuplicateKeyError:
+        return jsonify({"error": "Already a participant"}), 409
 
+    if deposit_amount > 0:
         # Create pending deposit record and payment intent
         payment_url = None
         try:
-            from app.payments.services.finternet import FinternetService
             finternet = FinternetService()
             intent_response = finternet.create_payment_intent(
                 amount=deposit_amount,
@@ -996,12 +1383,12 @@ def join_event_by_code(invite_code):
 
             mongo.event_deposits.insert_one({
                 "event_id": event_id,
-                "user_id": ObjectId(user_id),
+                "user_id": to_object_id(user_id),
                 "intent_id": intent_id,
                 "amount": deposit_amount,
                 "status": "pending",
                 "deposit_type": "member",
-                "created_at": datetime.utcnow()
+                "created_at": now
             })
 
             payment_url = finternet.get_payment_url(intent_response)
@@ -1026,18 +1413,7 @@ def join_event_by_code(invite_code):
             "payment_url": payment_url
         }), 201
     else:
-        # No deposit required: record participant and update pool immediately
-        mongo.participants.insert_one({
-            "event_id": event["_id"],
-            "user_id": safe_object_id(user_id),
-            "deposit_amount": 0,
-            "total_spent": 0,
-            "balance": 0,
-            "status": "active",
-            "categories": [],
-            "joined_via": "invite_code",
-            "created_at": datetime.utcnow()
-        })
+        # No deposit required: participant is already recorded
 
         NotificationService.notify_join_request(
             creator_id=str(event["creator_id"]),
@@ -1059,15 +1435,12 @@ def join_event_by_code(invite_code):
 
 @events_bp.route("/<event_id>/join-requests", methods=["GET"])
 @jwt_required()
-def get_join_requests(event_id):
+@resolve_ids("event_id")
+def get_join_requests(event_oid):
     """Get pending join requests for an event (creator only)."""
-    event_oid = safe_object_id(event_id)
-    user_id = safe_object_id(get_jwt_identity())
-    
-    if not event_oid:
-        return jsonify({"error": "Invalid event ID"}), 400
+    user_id = current_user_oid()
     
-    event = mongo.events.find_one({"_id": event_oid})
+    event = mongo.events.find_one({"_id": event_oid}, {"creator_id": 1})
     if not event:
         return jsonify({"error": "Event not found"}), 404
     
@@ -1075,30 +1448,23 @@ def get_join_requests(event_id):
     if event["creator_id"] != user_id:
         return jsonify({"error": "Only creator can view join requests"}), 403
     
-    requests = JoinRequestService.get_pending_requests(event_id)
+    requests = JoinRequestService.get_pending_requests(str(event_oid))
     
     return jsonify({"requests": requests})
 
 
 @events_bp.route("/<event_id>/join-requests/<request_id>/approve", methods=["POST"])
 @jwt_required()
-def approve_join_request(event_id, request_id):
+@resolve_ids("event_id", "request_id")
+def approve_join_request(event_oid, request_oid):
     """Approve a join request (creator only)."""
-    print(f"\n[APPROVE_JOIN] START - event_id={event_id}, request_id={request_id}")
+    print(f"\n[APPROVE_JOIN] START - event_id={event_oid}, request_id={request_oid}")
     
-    event_oid = safe_object_id(event_id)
     approver_id = str(get_jwt_identity())
-    request_oid = safe_object_id(request_id)
     
     print(f"[APPROVE_JOIN] approver_id={approver_id}")
     
-    if not event_oid:
-        return jsonify({"error": "Invalid event ID"}), 400
-    
-    if not request_oid:
-        return jsonify({"error": "Invalid request ID"}), 400
-    
-    event = mongo.events.find_one({"_id": event_oid})
+    event = mongo.events.find_one({"_id": event_oid}, {"creator_id": 1, "name": 1})
     if not event:
         print(f"[APPROVE_JOIN] ERROR - Event not found!")
         return jsonify({"error": "Event not found"}), 404
@@ -1109,7 +1475,7 @@ def approve_join_request(event_id, request_id):
         return jsonify({"error": "Only creator can approve requests"}), 403
     
     # Fetch the join request to get the user_id
-    join_request = mongo.join_requests.find_one({"_id": request_oid})
+    join_request = mongo.join_requests.find_one({"_id": request_oid}, {"status": 1, "user_id": 1})
     if not join_request:
         print(f"[APPROVE_JOIN] ERROR - Join request not found!")
         return jsonify({"error": "Join request not found"}), 404
@@ -1128,7 +1494,7 @@ def approve_join_request(event_id, request_id):
     
     # Call the service with the correct arguments
     success, error = JoinRequestService.approve_join_request(
-        event_id=event_id,
+        event_id=str(event_oid),
         user_id=target_user_id,
         approver_id=approver_id
     )
@@ -1142,7 +1508,7 @@ def approve_join_request(event_id, request_id):
         return jsonify({"error": error}), 400
     
     # Verify event still exists
-    event_check = mongo.events.find_one({"_id": event_oid})
+    event_check = mongo.events.find_one({"_id": event_oid}, {"_id": 1})
     print(f"[APPROVE_JOIN] Event still exists: {event_check is not None}")
     
     print(f"[APPROVE_JOIN] SUCCESS - approval completed\n")
@@ -1155,20 +1521,13 @@ def approve_join_request(event_id, request_id):
 
 @events_bp.route("/<event_id>/join-requests/<request_id>/reject", methods=["POST"])
 @jwt_required()
-def reject_join_request(event_id, request_id):
+@resolve_ids("event_id", "request_id")
+def reject_join_request(event_oid, request_oid):
     """Reject a join request (creator only)."""
-    event_oid = safe_object_id(event_id)
     rejector_id = str(get_jwt_identity())
-    request_oid = safe_object_id(request_id)
     data = request.get_json() or {}
     
-    if not event_oid:
-        return jsonify({"error": "Invalid event ID"}), 400
-    
-    if not request_oid:
-        return jsonify({"error": "Invalid request ID"}), 400
-    
-    event = mongo.events.find_one({"_id": event_oid})
+    event = mongo.events.find_one({"_id": event_oid}, {"creator_id": 1})
     if not event:
         return jsonify({"error": "Event not found"}), 404
     
@@ -1176,7 +1535,7 @@ def reject_join_request(event_id, request_id):
         return jsonify({"error": "Only creator can reject requests"}), 403
     
     # Fetch the join request to get the user_id
-    join_request = mongo.join_requests.find_one({"_id": request_oid})
+    join_request = mongo.join_requests.find_one({"_id": request_oid}, {"status": 1, "user_id": 1})
     if not join_request:
         return jsonify({"error": "Join request not found"}), 404
     
@@ -1187,7 +1546,7 @@ def reject_join_request(event_id, request_id):
     
     # Call the service with the correct arguments
     success, error = JoinRequestService.reject_join_request(
-        event_id=event_id,
+        event_id=str(event_oid),
         user_id=target_user_id,
         rejector_id=rejector_id,
         reason=data.get("reason")
@@ -1204,20 +1563,17 @@ def reject_join_request(event_id, request_id):
 
 @events_bp.route("/<event_id>/recalculate-pool", methods=["POST"])
 @jwt_required()
-def recalculate_pool(event_id):
+@resolve_ids("event_id")
+def recalculate_pool(event_oid):
     """
     Recalculate pool state from scratch based on deposits and expenses.
     
     Use this to fix any corrupted pool data.
     Only the creator can trigger a recalculation.
     """
-    event_oid = safe_object_id(event_id)
-    user_id = safe_object_id(get_jwt_identity())
-    
-    if not event_oid:
-        return jsonify({"error": "Invalid event ID"}), 400
+    user_id = current_user_oid()
     
-    event = mongo.events.find_one({"_id": event_oid})
+    event = mongo.events.find_one({"_id": event_oid}, {"creator_id": 1, "total_pool": 1, "total_spent": 1})
     if not event:
         return jsonify({"error": "Event not found"}), 404
     
@@ -1245,34 +1601,33 @@ def recalculate_pool(event_id):
 
 @events_bp.route("/<event_id>/invite-link", methods=["GET"])
 @jwt_required()
-def get_invite_link(event_id):
+@resolve_ids("event_id")
+def get_invite_link(event_oid):
     """Get the invite link and QR code data for an event."""
-    event_oid = safe_object_id(event_id)
-    user_id = safe_object_id(get_jwt_identity())
-    
-    if not event_oid:
-        return jsonify({"error": "Invalid event ID"}), 400
+    user_id = current_user_oid()
     
-    event = mongo.events.find_one({"_id": event_oid})
+    event = mongo.events.find_one(
+        {"_id": event_oid}, {"invite_code": 1, "invite_enabled": 1}
+    )
     if not event:
         return jsonify({"error": "Event not found"}), 404
     
     if not is_participant(event_oid, user_id):
         return jsonify({"error": "Not a participant"}), 403
     
-    invite_code = event.get("invite_code")
-    if not invite_code:
-        # Generate one if missing (for older events)
-        invite_code = generate_invite_code()
-        while mongo.events.find_one({"invite_code": invite_code}):
-            invite_code = generate_invite_code()
-        mongo.events.update_one(
-            {"_id": event_oid},
-            {"$set": {"invite_code": invite_code, "invite_enabled": True}}
+    if not event.get("invite_code"):
+        # Generate one if missing (for older events). The filter only
+        # matches while the code is still unset, so a concurrent request
+        # can't overwrite a code another one already handed out.
+        event = write_with_invite_code(lambda code: mongo.events.find_one_and_update(
+            {"_id": event_oid, "invite_code": {"$in": [None, ""]}},
+            {"$set": {"invite_code": code, "invite_enabled": True}},
+            projection={"invite_code": 1, "invite_enabled": 1},
+            return_document=ReturnDocument.AFTER
+        )) or mongo.events.find_one(
+            {"_id": event_oid}, {"invite_code": 1, "invite_enabled": 1}
         )
-    
-    base_url = request.host_url.rstrip("/")
-    invite_url = f"{base_url}/api/v1/events/join/{invite_code}"
+    invite_code = event["invite_code"]
     
     # Frontend join URL (for web app)
     frontend_url = request.headers.get("Origin", "http://localhost:8080")
@@ -1280,7 +1635,7 @@ def get_invite_link(event_id):
     
     return jsonify({
         "invite_code": invite_code,
-        "invite_url": invite_url,
+        "invite_url": invite_url(invite_code),
         "frontend_join_url": frontend_join_url,
         "invite_enabled": event.get("invite_enabled", True),
         "qr_data": frontend_join_url  # Use this to generate QR on frontend
@@ -1289,51 +1644,59 @@ def get_invite_link(event_id):
 
 @events_bp.route("/<event_id>/invite-link", methods=["PUT"])
 @jwt_required()
-def toggle_invite_link(event_id):
+@resolve_ids("event_id")
+def toggle_invite_link(event_oid):
     """Enable/disable invite link or regenerate code."""
-    event_oid = safe_object_id(event_id)
-    user_id = safe_object_id(get_jwt_identity())
+    user_id = current_user_oid()
     data = request.get_json() or {}
     
-    if not event_oid:
-        return jsonify({"error": "Invalid event ID"}), 400
-    
-    event = mongo.events.find_one({"_id": event_oid})
-    if not event:
-        return jsonify({"error": "Event not found"}), 404
-    
-    # Only creator can manage invite settings
-    if event["creator_id"] != user_id:
-        return jsonify({"error": "Only event creator can manage invites"}), 403
-    
     update = {}
     
     if "enabled" in data:
         update["invite_enabled"] = bool(data["enabled"])
     
+    # Only the creator's writes match, so authorization needs no pre-read.
+    # The settings come back as they were before the write, which is what
+    # the stale preview is cached under; the new values are known here.
+    creator_filter = {"_id": event_oid, "creator_id": user_id}
+    settings = {"invite_code": 1, "invite_enabled": 1}
+    
+    def write(fields):
+        event = mongo.events.find_one_and_update(
+            creator_filter, {"$set": fields}, projection=settings
+        )
+        return event, fields
+    
     if data.get("regenerate"):
-        new_code = generate_invite_code()
-        while mongo.events.find_one({"invite_code": new_code}):
-            new_code = generate_invite_code()
-        update["invite_code"] = new_code
+        event, changed = write_with_invite_code(
+            lambda code: write({**update, "invite_code": code})
+        )
+    elif update:
+        event, changed = write(update)
+    else:
+        event, changed = mongo.events.find_one(creator_filter, settings), {}
     
-    if update:
-        mongo.events.update_one({"_id": event_oid}, {"$set": update})
+    if event is None:
+        if mongo.events.find_one({"_id": event_oid}, {"_id": 1}) is None:
+            return jsonify({"error": "Event not found"}), 404
+        return jsonify({"error": "Only event creator can manage invites"}), 403
     
-    # Return updated info
-    updated_event = mongo.events.find_one({"_id": event_oid})
-    base_url = request.host_url.rstrip("/")
+    if changed:
+        invalidate_invite_cache(event)
+    updated_event = {**event, **changed}
     
     return jsonify({
         "invite_code": updated_event.get("invite_code"),
         "invite_enabled": updated_event.get("invite_enabled", True),
-        "invite_url": f"{base_url}/api/v1/events/join/{updated_event.get('invite_code')}"
+        "invite_url": invite_url(updated_event.get("invite_code"))
     })
 
 
 @events_bp.route("/<event_id>/deposit", methods=["POST"])
 @jwt_required()
-def deposit(event_id):
+@resolve_ids("event_id")
+@idempotent
+def deposit(event_oid):
     """
     Deposit money to an event.
     
@@ -1346,29 +1709,28 @@ def deposit(event_id):
         "amount": 100.00,
         "use_finternet": true  // optional, creates payment intent
     }
-    """
-    from app.payments.services.finternet import FinternetService
-    from app.payments.models import PaymentIntentDB
     
-    event_oid = safe_object_id(event_id)
-    user_id = safe_object_id(get_jwt_identity())
-    data = request.get_json()
-
-    if not event_oid:
-        return jsonify({"error": "Invalid event ID"}), 400
+    Send an Idempotency-Key header to make client retries safe: a repeat
+    with the same key replays the first response instead of depositing again.
+    """
+    user_id = current_user_oid()
+    data = request.get_json() or {}
+    now = datetime.utcnow()
 
+    # An exact type check also rejects bool, which subclasses int
     amount = data.get("amount")
-    if not isinstance(amount, (int, float)) or amount <= 0:
+    if type(amount) not in (int, float) or amount <= 0:
         return jsonify({"error": "Invalid deposit amount"}), 400
 
-    event = mongo.events.find_one({"_id": event_oid})
+    participant_future = executor.submit(is_participant, event_oid, user_id)
+    event = mongo.events.find_one({"_id": event_oid}, {"status": 1, "name": 1})
+    participant = participant_future.result()
     if not event:
         return jsonify({"error": "Event not found"}), 404
 
     if event["status"] != "active":
         return jsonify({"error": "Event is closed"}), 400
 
-    participant = is_participant(event_oid, user_id)
     if not participant:
         return jsonify({"error": "Not a participant"}), 403
 
@@ -1408,27 +1770,16 @@ def deposit(event_id):
         payment_url = finternet.get_payment_url(intent_response)
         
         # Generate transaction hash for blockchain simulation
-        import uuid
-        tx_hash = "0x" + uuid.uuid4().hex + uuid.uuid4().hex[:24]
-        block_number = 19847293 + int(uuid.uuid4().int % 10000)
+        tx_hash = "0x" + secrets.token_hex(32)
+        block_number = 19847293 + secrets.randbelow(10000)
         
         # OPTIMISTIC UPDATE: Immediately credit the deposit
         # This ensures the deposit works regardless of payment gateway status
-        mongo.participants.update_one(
-            {"_id": participant["_id"]},
-            {"$inc": {
-                "deposit_amount": amount,
-                "balance": amount
-            }}
-        )
-
-        mongo.events.update_one(
-            {"_id": event_oid},
-            {"$inc": {"total_pool": amount}}
-        )
+        if not apply_deposit(event_oid, user_id, amount):
+            return jsonify({"error": "Not a participant"}), 403
         
         # Log deposit activity with blockchain details
-        mongo.activities.insert_one({
+        log_activity({
             "type": "deposit",
             "event_id": event_oid,
             "user_id": user_id,
@@ -1439,7 +1790,7 @@ def deposit(event_id):
             "block_number": block_number,
             "chain": "Sepolia",
             "status": "confirmed",
-            "created_at": datetime.utcnow()
+            "created_at": now
         })
         
         return jsonify({
@@ -1456,27 +1807,17 @@ def deposit(event_id):
         })
     
     # Direct deposit (no Finternet)
-    mongo.participants.update_one(
-        {"_id": participant["_id"]},
-        {"$inc": {
-            "deposit_amount": amount,
-            "balance": amount
-        }}
-    )
-
-    mongo.events.update_one(
-        {"_id": event_oid},
-        {"$inc": {"total_pool": amount}}
-    )
+    if not apply_deposit(event_oid, user_id, amount):
+        return jsonify({"error": "Not a participant"}), 403
 
     # Log deposit activity
-    mongo.activities.insert_one({
+    log_activity({
         "type": "deposit",
         "event_id": event_oid,
         "user_id": user_id,
         "amount": amount,
         "description": "Deposit",
-        "created_at": datetime.utcnow()
+        "created_at": now
     })
 
     return jsonify({
@@ -1491,62 +1832,72 @@ def deposit(event_id):
 @jwt_required()
 def get_friends():
     """Get all friends of current user."""
-    user_id = safe_object_id(get_jwt_identity())
-    
-    friendships = mongo.friendships.find({
-        "$or": [
-            {"user_id": user_id, "status": "accepted"},
-            {"friend_id": user_id, "status": "accepted"}
-        ]
-    })
-    
-    friends = []
-    for f in friendships:
-        # Get the other user's ID
-        friend_user_id = f["friend_id"] if f["user_id"] == user_id else f["user_id"]
-        user = mongo.users.find_one({"_id": friend_user_id})
-        if user:
-            friends.append({
-                "friendship_id": str(f["_id"]),
-                "user_id": str(friend_user_id),
-                "name": user.get("name", "Unknown"),
-                "email": user.get("email"),
-                "since": f.get("accepted_at", f.get("created_at"))
-            })
+    user_id = current_user_oid()
+    
+    friends = mongo.friendships.aggregate([
+        {"$match": {
+            "$or": [
+                {"user_id": user_id, "status": "accepted"},
+                {"friend_id": user_id, "status": "accepted"}
+            ]
+        }},
+        # The friend is whichever side of the friendship isn't the current user
+        {"$addFields": {
+            "other_id": {"$cond": [{"$eq": ["$user_id", user_id]}, "$friend_id", "$user_id"]}
+        }},
+        {"$lookup": {
+            "from": "users",
+            "localField": "other_id",
+            "foreignField": "_id",
+            "as": "user"
+        }},
+        # Drops friendships whose user no longer exists
+        {"$unwind": "$user"},
+        {"$project": {
+            "_id": 0,
+            "friendship_id": {"$toString": "$_id"},
+            "user_id": {"$toString": "$other_id"},
+            "name": {"$ifNull": ["$user.name", "Unknown"]},
+            "email": {"$ifNull": ["$user.email", None]},
+            "since": {"$ifNull": ["$accepted_at", {"$ifNull": ["$created_at", None]}]}
+        }}
+    ])
     
-    return jsonify({"friends": friends})
+    return stream_list("friends", friends)
 
 
 @events_bp.route("/friends/requests", methods=["GET"])
 @jwt_required()
 def get_friend_requests():
     """Get pending friend requests (received)."""
-    user_id = safe_object_id(get_jwt_identity())
-    
-    requests = mongo.friendships.find({
-        "friend_id": user_id,
-        "status": "pending"
-    })
-    
-    pending = []
-    for r in requests:
-        sender = mongo.users.find_one({"_id": r["user_id"]})
-        pending.append({
-            "request_id": str(r["_id"]),
-            "from_user_id": str(r["user_id"]),
-            "from_name": sender.get("name") if sender else "Unknown",
-            "from_email": sender.get("email") if sender else None,
-            "created_at": r.get("created_at")
-        })
+    user_id = current_user_oid()
+    
+    pending = mongo.friendships.aggregate([
+        {"$match": {"friend_id": user_id, "status": "pending"}},
+        {"$lookup": {
+            "from": "users",
+            "localField": "user_id",
+            "foreignField": "_id",
+            "as": "sender"
+        }},
+        {"$project": {
+            "_id": 0,
+            "request_id": {"$toString": "$_id"},
+            "from_user_id": {"$toString": "$user_id"},
+            "from_name": {"$ifNull": [{"$arrayElemAt": ["$sender.name", 0]}, "Unknown"]},
+            "from_email": {"$ifNull": [{"$arrayElemAt": ["$sender.email", 0]}, None]},
+            "created_at": {"$ifNull": ["$created_at", None]}
+        }}
+    ])
     
-    return jsonify({"requests": pending})
+    return stream_list("requests", pending)
 
 
 @events_bp.route("/friends/request", methods=["POST"])
 @jwt_required()
 def send_friend_request():
     """Send a friend request to another user."""
-    user_id = safe_object_id(get_jwt_identity())
+    user_id = current_user_oid()
     data = request.get_json()
     
     friend_email = data.get("email")
@@ -1554,9 +1905,9 @@ def send_friend_request():
     
     # Find friend by email or user_id
     if friend_email:
-        friend = mongo.users.find_one({"email": friend_email})
+        friend = mongo.users.find_one({"email": friend_email}, {"name": 1})
     elif friend_user_id:
-        friend = mongo.users.find_one({"_id": friend_user_id})
+        friend = mongo.users.find_one({"_id": friend_user_id}, {"name": 1})
     else:
         return jsonify({"error": "Provide email or user_id"}), 400
     
@@ -1568,26 +1919,30 @@ def send_friend_request():
     if friend_id == user_id:
         return jsonify({"error": "Cannot add yourself as friend"}), 400
     
-    # Check if friendship already exists
-    existing = mongo.friendships.find_one({
-        "$or": [
-            {"user_id": user_id, "friend_id": friend_id},
-            {"user_id": friend_id, "friend_id": user_id}
-        ]
-    })
+    # Either direction counts as an existing friendship. Inserting through
+    # an upsert on the pair checks and writes in one round trip, and the
+    # unique pair index stops a concurrent request from inserting a second row.
+    pair = pair_filter(user_id, friend_id)
+    try:
+        result = mongo.friendships.update_one(
+            pair,
+            {"$setOnInsert": {
+                "user_id": user_id,
+                "friend_id": friend_id,
+                "status": "pending",
+                "created_at": datetime.utcnow()
+            }},
+            upsert=True
+        )
+        inserted = result.upserted_id is not None
+    except DuplicateKeyError:
+        inserted = False
     
-    if existing:
-        if existing["status"] == "accepted":
+    if not inserted:
+        existing = mongo.friendships.find_one(pair, {"status": 1})
+        if existing and existing["status"] == "accepted":
             return jsonify({"error": "Already friends"}), 409
-        elif existing["status"] == "pending":
-            return jsonify({"error": "Friend request already pending"}), 409
-    
-    mongo.friendships.insert_one({
-        "user_id": user_id,
-        "friend_id": friend_id,
-        "status": "pending",
-        "created_at": datetime.utcnow()
-    })
+        return jsonify({"error": "Friend request already pending"}), 409
     
     return jsonify({
         "message": "Friend request sent",
@@ -1597,32 +1952,24 @@ def send_friend_request():
 
 @events_bp.route("/friends/request/<request_id>/accept", methods=["POST"])
 @jwt_required()
-def accept_friend_request(request_id):
+@resolve_ids("request_id")
+def accept_friend_request(request_oid):
     """Accept a friend request."""
-    user_id = safe_object_id(get_jwt_identity())
-    request_oid = safe_object_id(request_id)
-    
-    if not request_oid:
-        return jsonify({"error": "Invalid request ID"}), 400
-    
-    friendship = mongo.friendships.find_one({
-        "_id": request_oid,
-        "friend_id": user_id,
-        "status": "pending"
-    })
+    user_id = current_user_oid()
     
-    if not friendship:
-        return jsonify({"error": "Friend request not found"}), 404
-    
-    mongo.friendships.update_one(
-        {"_id": request_oid},
+    friendship = mongo.friendships.find_one_and_update(
+        {"_id": request_oid, "friend_id": user_id, "status": "pending"},
         {"$set": {
             "status": "accepted",
             "accepted_at": datetime.utcnow()
-        }}
+        }},
+        projection={"user_id": 1}
     )
     
-    sender = mongo.users.find_one({"_id": friendship["user_id"]})
+    if not friendship:
+        return jsonify({"error": "Friend request not found"}), 404
+    
+    sender = mongo.users.find_one({"_id": friendship["user_id"]}, {"name": 1})
     
     return jsonify({
         "message": "Friend request accepted",
@@ -1632,13 +1979,10 @@ def accept_friend_request(request_id):
 
 @events_bp.route("/friends/request/<request_id>/reject", methods=["POST"])
 @jwt_required()
-def reject_friend_request(request_id):
+@resolve_ids("request_id")
+def reject_friend_request(request_oid):
     """Reject a friend request."""
-    user_id = safe_object_id(get_jwt_identity())
-    request_oid = safe_object_id(request_id)
-    
-    if not request_oid:
-        return jsonify({"error": "Invalid request ID"}), 400
+    user_id = current_user_oid()
     
     result = mongo.friendships.delete_one({
         "_id": request_oid,
@@ -1654,19 +1998,14 @@ def reject_friend_request(request_id):
 
 @events_bp.route("/friends/<friend_id>/remove", methods=["DELETE"])
 @jwt_required()
-def remove_friend(friend_id):
+@resolve_ids("friend_id")
+def remove_friend(friend_oid):
     """Remove a friend."""
-    user_id = safe_object_id(get_jwt_identity())
-    friend_oid = safe_object_id(friend_id)
-    
-    if not friend_oid:
-        return jsonify({"error": "Invalid friend ID"}), 400
+    user_id = current_user_oid()
     
     result = mongo.friendships.delete_one({
-        "$or": [
-            {"user_id": user_id, "friend_id": friend_oid, "status": "accepted"},
-            {"user_id": friend_oid, "friend_id": user_id, "status": "accepted"}
-        ]
+        **pair_filter(user_id, friend_oid),
+        "status": "accepted"
     })
     
     if result.deleted_count == 0:
@@ -1679,15 +2018,12 @@ def remove_friend(friend_id):
 
 @events_bp.route("/<event_id>/invite", methods=["POST"])
 @jwt_required()
-def invite_to_event(event_id):
+@resolve_ids("event_id")
+def invite_to_event(event_oid):
     """Invite a user (friend) to join an event."""
-    user_id = safe_object_id(get_jwt_identity())
-    event_oid = safe_object_id(event_id)
+    user_id = current_user_oid()
     data = request.get_json()
     
-    if not event_oid:
-        return jsonify({"error": "Invalid event ID"}), 400
-    
     # Check if user is participant of event
     if not is_participant(event_oid, user_id):
         return jsonify({"error": "You must be a participant to invite others"}), 403
@@ -1697,9 +2033,9 @@ def invite_to_event(event_id):
     
     # Find invitee
     if invite_email:
-        invitee = mongo.users.find_one({"email": invite_email})
+        invitee = mongo.users.find_one({"email": invite_email}, {"name": 1})
     elif invite_user_id:
-        invitee = mongo.users.find_one({"_id": invite_user_id})
+        invitee = mongo.users.find_one({"_id": invite_user_id}, {"name": 1})
     else:
         return jsonify({"error": "Provide email or user_id"}), 400
     
@@ -1712,27 +2048,21 @@ def invite_to_event(event_id):
     if is_participant(event_oid, invitee_id):
         return jsonify({"error": "User is already a participant"}), 409
     
-    # Check if invite already exists
-    existing_invite = mongo.event_invites.find_one({
-        "event_id": event_oid,
-        "invitee_id": invitee_id,
-        "status": "pending"
-    })
+    event = mongo.events.find_one({"_id": event_oid}, {"name": 1})
     
-    if existing_invite:
+    # The partial unique index on pending invites rejects a second one
+    try:
+        mongo.event_invites.insert_one({
+            "event_id": event_oid,
+            "event_name": event.get("name"),
+            "inviter_id": user_id,
+            "invitee_id": invitee_id,
+            "status": "pending",
+            "created_at": datetime.utcnow()
+        })
+    except DuplicateKeyError:
         return jsonify({"error": "Invite already pending"}), 409
     
-    event = mongo.events.find_one({"_id": event_oid})
-    
-    mongo.event_invites.insert_one({
-        "event_id": event_oid,
-        "event_name": event.get("name"),
-        "inviter_id": user_id,
-        "invitee_id": invitee_id,
-        "status": "pending",
-        "created_at": datetime.utcnow()
-    })
-    
     return jsonify({
         "message": "Invite sent",
         "to_user": invitee.get("name")
@@ -1743,84 +2073,88 @@ def invite_to_event(event_id):
 @jwt_required()
 def get_event_invites():
     """Get pending event invites for current user."""
-    user_id = safe_object_id(get_jwt_identity())
-    
-    invites = mongo.event_invites.find({
-        "invitee_id": user_id,
-        "status": "pending"
-    })
-    
-    pending = []
-    for inv in invites:
-        inviter = mongo.users.find_one({"_id": inv["inviter_id"]})
-        pending.append({
-            "invite_id": str(inv["_id"]),
-            "event_id": str(inv["event_id"]),
-            "event_name": inv.get("event_name"),
-            "from_user_id": str(inv["inviter_id"]),
-            "from_name": inviter.get("name") if inviter else "Unknown",
-            "created_at": inv.get("created_at")
-        })
+    user_id = current_user_oid()
+    
+    pending = mongo.event_invites.aggregate([
+        {"$match": {"invitee_id": user_id, "status": "pending"}},
+        {"$lookup": {
+            "from": "users",
+            "localField": "inviter_id",
+            "foreignField": "_id",
+            "as": "inviter"
+        }},
+        {"$project": {
+            "_id": 0,
+            "invite_id": {"$toString": "$_id"},
+            "event_id": {"$toString": "$event_id"},
+            "event_name": {"$ifNull": ["$event_name", None]},
+            "from_user_id": {"$toString": "$inviter_id"},
+            "from_name": {"$ifNull": [{"$arrayElemAt": ["$inviter.name", 0]}, "Unknown"]},
+            "created_at": {"$ifNull": ["$created_at", None]}
+        }}
+    ])
     
-    return jsonify({"invites": pending})
+    return stream_list("invites", pending)
 
 
 @events_bp.route("/invites/<invite_id>/accept", methods=["POST"])
 @jwt_required()
-def accept_event_invite(invite_id):
+@resolve_ids("invite_id")
+def accept_event_invite(invite_oid):
     """Accept an event invite and join the event."""
-    user_id = safe_object_id(get_jwt_identity())
-    invite_oid = safe_object_id(invite_id)
-    
-    if not invite_oid:
-        return jsonify({"error": "Invalid invite ID"}), 400
+    user_id = current_user_oid()
+    
+    now = datetime.utcnow()
+    pending_invite = {"_id": invite_oid, "invitee_id": user_id, "status": "pending"}
+    accepted = {"$set": {"status": "accepted", "accepted_at": now}}
+    
+    def join(session):
+        # Claim the invite and read what the participant row needs in one go
+        invite = mongo.event_invites.find_one_and_update(
+            pending_invite,
+            accepted,
+            projection={"event_id": 1, "event_name": 1, "inviter_id": 1},
+            session=session
+        )
+        if invite is None:
+            return None
+        mongo.participants.insert_one({
+            "event_id": invite["event_id"],
+            "user_id": user_id,
+            "deposit_amount": 0,
+            "total_spent": 0,
+            "balance": 0,
+            "status": "active",
+            "categories": [],
+            "invited_by": invite["inviter_id"],
+            "created_at": now
+        }, session=session)
+        return invite
     
-    invite = mongo.event_invites.find_one({
-        "_id": invite_oid,
-        "invitee_id": user_id,
-        "status": "pending"
-    })
+    # Add as participant and close the invite together
+    try:
+        invite = run_in_transaction(join)
+    except DuplicateKeyError:
+        # The transaction rolled back; still close out the invite
+        mongo.event_invites.update_one(pending_invite, accepted)
+        return jsonify({"error": "Already a participant"}), 409
     
-    if not invite:
+    if invite is None:
         return jsonify({"error": "Invite not found"}), 404
     
-    event_id = invite["event_id"]
-    
-    # Add as participant
-    mongo.participants.insert_one({
-        "event_id": event_id,
-        "user_id": user_id,
-        "deposit_amount": 0,
-        "total_spent": 0,
-        "balance": 0,
-        "status": "active",
-        "categories": [],
-        "invited_by": invite["inviter_id"],
-        "created_at": datetime.utcnow()
-    })
-    
-    # Update invite status
-    mongo.event_invites.update_one(
-        {"_id": invite_oid},
-        {"$set": {"status": "accepted", "accepted_at": datetime.utcnow()}}
-    )
-    
     return jsonify({
         "message": "Invite accepted, you have joined the event",
-        "event_id": str(event_id),
+        "event_id": str(invite["event_id"]),
         "event_name": invite.get("event_name")
     })
 
 
 @events_bp.route("/invites/<invite_id>/reject", methods=["POST"])
 @jwt_required()
-def reject_event_invite(invite_id):
+@resolve_ids("invite_id")
+def reject_event_invite(invite_oid):
     """Reject an event invite."""
-    user_id = safe_object_id(get_jwt_identity())
-    invite_oid = safe_object_id(invite_id)
-    
-    if not invite_oid:
-        return jsonify({"error": "Invalid invite ID"}), 400
+    user_id = current_user_oid()
     
     result = mongo.event_invites.update_one(
         {"_id": invite_oid, "invitee_id": user_id, "status": "pending"},
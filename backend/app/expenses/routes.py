@@ -6,6 +6,8 @@ from bson import ObjectId
 from datetime import datetime
 
 from app.extensions import db as mongo
+from app.utils.ids import to_object_id
+from app.utils.request_cache import get_event
 from app.utils.merkle_tree import EventMerkleTree
 from app.payments.services.finternet import FinternetService
 from app.core import (
@@ -51,14 +53,14 @@ def add_expense():
     selected_members = data.get("selected_members")  # Optional: list of user IDs for custom splits
 
     # Get event
-    event = mongo.events.find_one({"_id": ObjectId(event_id)})
+    event = get_event(event_id)
     if not event:
         return jsonify({"error": "Event not found"}), 404
 
     # Check if user is authorized participant
     participant = mongo.participants.find_one({
         "event_id": ObjectId(event_id),
-        "user_id": ObjectId(user_id),
+        "user_id": to_object_id(user_id),
         "status": "active"
     })
     if not participant:
@@ -198,7 +200,7 @@ def add_expense():
     # Create the expense record
     expense = {
         "event_id": ObjectId(event_id),
-        "payer_id": ObjectId(user_id),
+        "payer_id": to_object_id(user_id),
         "amount": amount,
         "description": description,
         "category_id": ObjectId(category_id) if category_id else None,
@@ -336,7 +338,7 @@ def add_expense():
     mongo.activities.insert_one({
         "type": "expense",
         "event_id": ObjectId(event_id),
-        "user_id": ObjectId(user_id),
+        "user_id": to_object_id(user_id),
         "amount": amount,
         "description": description or "Expense",
         "expense_id": result.inserted_id,
@@ -380,8 +382,6 @@ def get_event_expenses(event_id):
 @jwt_required()
 def get_categories():
     categories = list(mongo.categories.find())
-    for c in categories:
-        c["_id"] = str(c["_id"])
     return jsonify({"categories": categories})
 
 @expenses_bp.route("/<expense_id>/verify", methods=["POST"])
@@ -684,7 +684,7 @@ def create_expense_with_payment():
     # Check if user is authorized participant
     participant = mongo.participants.find_one({
         "event_id": ObjectId(event_id),
-        "user_id": ObjectId(user_id),
+        "user_id": to_object_id(user_id),
         "status": "active"
     })
     if not participant:
@@ -781,7 +781,7 @@ def create_expense_with_payment():
     # === STEP 1: Create expense record FIRST (before payment) ===
     expense = {
         "event_id": ObjectId(event_id),
-        "payer_id": ObjectId(user_id),
+        "payer_id": to_object_id(user_id),
         "amount": amount,
         "description": description,
         "category_id": ObjectId(category_id) if category_id else None,
@@ -863,7 +863,7 @@ def create_expense_with_payment():
         mongo.activities.insert_one({
             "type": "expense",
             "event_id": ObjectId(event_id),
-            "user_id": ObjectId(user_id),
+            "user_id": to_object_id(user_id),
             "amount": amount,
             "description": description or "Expense (Finternet payment)",
             "expense_id": ObjectId(expense_id),
@@ -1143,7 +1143,7 @@ def add_cash_expense():
     # Check if user is authorized participant
     participant = mongo.participants.find_one({
         "event_id": ObjectId(event_id),
-        "user_id": ObjectId(user_id),
+        "user_id": to_object_id(user_id),
         "status": "active"
     })
     if not participant:
@@ -1219,7 +1219,7 @@ def add_cash_expense():
     # Create the cash expense record
     expense = {
         "event_id": ObjectId(event_id),
-        "payer_id": ObjectId(user_id),
+        "payer_id": to_object_id(user_id),
         "amount": amount,
         "description": description,
         "payment_method": "cash",
@@ -1240,7 +1240,7 @@ def add_cash_expense():
     # Notify all members who need to approve
     for member_id in members_needing_approval:
         member = mongo.users.find_one({"_id": ObjectId(member_id)})
-        payer = mongo.users.find_one({"_id": ObjectId(user_id)})
+        payer = mongo.users.find_one({"_id": to_object_id(user_id)})
         
         # Get this member's share
         member_share = next((s["amount"] for s in splits if s["user_id"] == member_id), 0)
@@ -1376,7 +1376,7 @@ def reject_cash_expense(expense_id):
         return jsonify({"error": "You are not part of this expense split"}), 403
 
     # Get rejector info
-    rejector = mongo.users.find_one({"_id": ObjectId(user_id)})
+    rejector = mongo.users.find_one({"_id": to_object_id(user_id)})
     
     # Mark expense as rejected
     mongo.expenses.update_one(
@@ -1385,7 +1385,7 @@ def reject_cash_expense(expense_id):
             "$set": {
                 "status": "rejected",
                 "approval_status": "rejected",
-                "rejected_by": ObjectId(user_id),
+                "rejected_by": to_object_id(user_id),
                 "rejection_reason": reason,
                 "rejected_at": datetime.utcnow()
             }
@@ -1,12 +1,103 @@
-from pymongo import MongoClient
+from concurrent.futures import ThreadPoolExecutor
+
+from pymongo import MongoClient, ASCENDING, DESCENDING
+from pymongo.errors import ConnectionFailure, OperationFailure, PyMongoError
 
 _client = None
 _db = None
 
+# Shared pool for issuing independent queries concurrently within a request.
+# PyMongo is thread-safe and releases the GIL while waiting on the network.
+executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="mongo-fanout")
+
+# Payment gateway calls block for seconds at a time, so they get their own
+# small pool instead of tying up the Mongo fan-out workers
+gateway_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="payment-gateway")
+
+# (collection, keys, options) for indexes backing the hot query paths
+INDEXES = [
+    ("participants", [("user_id", ASCENDING), ("event_id", ASCENDING)], {"unique": True}),
+    ("participants", [("event_id", ASCENDING), ("user_id", ASCENDING)], {}),
+    # Active-participant counts joined into the event list read only this index
+    ("participants", [("event_id", ASCENDING), ("status", ASCENDING)], {}),
+    ("activities", [("event_id", ASCENDING), ("created_at", DESCENDING)], {}),
+    ("expenses", [("payer_id", ASCENDING), ("created_at", DESCENDING)], {}),
+    ("expenses", [("event_id", ASCENDING), ("created_at", DESCENDING)], {}),
+    ("wallet_transactions", [("user_id", ASCENDING), ("created_at", DESCENDING)], {}),
+    ("wallets", [("user_id", ASCENDING)], {"unique": True}),
+    # Older events may have no invite_code, so only index the ones that do
+    ("events", [("invite_code", ASCENDING)], {
+        "unique": True,
+        "partialFilterExpression": {"invite_code": {"$type": "string"}}
+    }),
+    ("friendships", [("user_id", ASCENDING), ("friend_id", ASCENDING)], {"unique": True}),
+    # Canonically ordered pair, so a friendship is unique in either direction.
+    # Rows written before pair_a/pair_b existed are left out of the index
+    # until backfill_friendship_pairs() fills them in.
+    ("friendships", [("pair_a", ASCENDING), ("pair_b", ASCENDING)], {
+        "unique": True,
+        "partialFilterExpression": {"pair_a": {"$exists": True}}
+    }),
+    ("friendships", [("friend_id", ASCENDING), ("status", ASCENDING)], {}),
+    ("friendships", [("user_id", ASCENDING), ("status", ASCENDING)], {}),
+    # At most one pending invite per user per event
+    ("event_invites", [("event_id", ASCENDING), ("invitee_id", ASCENDING), ("status", ASCENDING)], {
+        "unique": True,
+        "partialFilterExpression": {"status": "pending"}
+    }),
+    ("event_invites", [("invitee_id", ASCENDING), ("status", ASCENDING)], {}),
+    # Stored responses for Idempotency-Key replays are kept for a day
+    ("idempotency_keys", [("created_at", ASCENDING)], {"expireAfterSeconds": 86400}),
+]
+
+def ensure_indexes(database):
+    """Create the indexes in INDEXES. Idempotent, so safe to run on every startup."""
+    for collection, keys, options in INDEXES:
+        try:
+            database[collection].create_index(keys, **options)
+        except ConnectionFailure as e:
+            print(f"[MongoDB] Skipping index creation, server unreachable: {e}")
+            return
+        except PyMongoError as e:
+            # e.g. existing duplicates blocking a unique index - don't fail startup
+            print(f"[MongoDB] Could not create index on {collection} {keys}: {e}")
+
+def backfill_friendship_pairs(database):
+    """
+    Give friendships written before pair_a/pair_b existed their canonical pair.
+
+    Lookups by pair only find rows that have it. A row whose reverse already
+    holds the pair is a pre-existing duplicate and is left as it is.
+    """
+    try:
+        legacy = list(database.friendships.find(
+            {"pair_a": {"$exists": False}}, {"user_id": 1, "friend_id": 1}
+        ))
+    except ConnectionFailure as e:
+        print(f"[MongoDB] Skipping friendship backfill, server unreachable: {e}")
+        return
+    for row in legacy:
+        pair_a, pair_b = sorted([row["user_id"], row["friend_id"]])
+        try:
+            database.friendships.update_one(
+                {"_id": row["_id"]},
+                {"$set": {"pair_a": pair_a, "pair_b": pair_b}}
+            )
+        except PyMongoError as e:
+            print(f"[MongoDB] Could not backfill friendship {row['_id']}: {e}")
+
 def init_mongo(app):
     global _client, _db
     mongo_uri = app.config["MONGO_URI"]
-    _client = MongoClient(mongo_uri)
+    _client = MongoClient(
+        mongo_uri,
+        maxPoolSize=app.config.get("MONGO_MAX_POOL_SIZE", 100),
+        minPoolSize=app.config.get("MONGO_MIN_POOL_SIZE", 10),
+        maxIdleTimeMS=app.config.get("MONGO_MAX_IDLE_TIME_MS", 30000),
+        waitQueueTimeoutMS=app.config.get("MONGO_WAIT_QUEUE_TIMEOUT_MS", 2000),
+        serverSelectionTimeoutMS=app.config.get("MONGO_SERVER_SELECTION_TIMEOUT_MS", 2000),
+        retryWrites=True,
+    )
     
     # get_default_database() extracts DB name from URI (e.g., /prepify?)
     # If that fails, use a fallback
@@ -16,6 +107,8 @@ def init_mongo(app):
         _db = _client["hacks"]
     
     print(f"[MongoDB] Connected to database: {_db.name}")
+    ensure_indexes(_db)
+    backfill_friendship_pairs(_db)
 
 def get_db():
     """Get the database instance. Must be called after init_mongo."""
@@ -25,6 +118,22 @@ def get_client():
     """Get the MongoDB client instance. Must be called after init_mongo."""
     return _client
 
+def run_in_transaction(callback):
+    """
+    Run callback(session) inside a multi-document transaction.
+    
+    Standalone mongod does not support transactions; there the callback is
+    run once without a session so local development keeps working.
+    """
+    with _client.start_session() as session:
+        try:
+            return session.with_transaction(callback)
+        except OperationFailure as e:
+            # IllegalOperation: transactions need a replica set or mongos
+            if e.code != 20:
+                raise
+    return callback(None)
+
 # For backward compatibility, create a proxy that always returns current db
 class _DBProxy:
     def __getattr__(self, name):
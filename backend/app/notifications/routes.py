@@ -5,6 +5,7 @@ from bson import ObjectId
 from datetime import datetime
 
 from app.extensions import db as mongo
+from app.utils.ids import to_object_id
 from app.core import NotificationService
 
 bp = Blueprint("notifications", __name__)
@@ -30,7 +31,7 @@ def get_notifications():
     skip = (page - 1) * per_page
     
     # Build query
-    query = {"user_id": ObjectId(user_id)}
+    query = {"user_id": to_object_id(user_id)}
     if unread_only:
         query["read"] = False
     
@@ -45,17 +46,10 @@ def get_notifications():
     # Count total and unread
     total = mongo.notifications.count_documents(query)
     unread_count = mongo.notifications.count_documents({
-        "user_id": ObjectId(user_id),
+        "user_id": to_object_id(user_id),
         "read": False
     })
     
-    # Format response
-    for notif in notifications:
-        notif["_id"] = str(notif["_id"])
-        notif["user_id"] = str(notif["user_id"])
-        if notif.get("created_at"):
-            notif["created_at"] = notif["created_at"].isoformat()
-    
     return jsonify({
         "notifications": notifications,
         "page": page,
@@ -73,7 +67,7 @@ def get_unread_count():
     user_id = get_jwt_identity()
     
     count = mongo.notifications.count_documents({
-        "user_id": ObjectId(user_id),
+        "user_id": to_object_id(user_id),
         "read": False
     })
     
@@ -92,7 +86,7 @@ def mark_as_read(notification_id):
         return jsonify({"error": "Invalid notification ID"}), 400
     
     result = mongo.notifications.update_one(
-        {"_id": notif_oid, "user_id": ObjectId(user_id)},
+        {"_id": notif_oid, "user_id": to_object_id(user_id)},
         {"$set": {"read": True, "read_at": datetime.utcnow()}}
     )
     
@@ -109,7 +103,7 @@ def mark_all_as_read():
     user_id = get_jwt_identity()
     
     result = mongo.notifications.update_many(
-        {"user_id": ObjectId(user_id), "read": False},
+        {"user_id": to_object_id(user_id), "read": False},
         {"$set": {"read": True, "read_at": datetime.utcnow()}}
     )
     
@@ -132,7 +126,7 @@ def delete_notification(notification_id):
     
     result = mongo.notifications.delete_one({
         "_id": notif_oid,
-        "user_id": ObjectId(user_id)
+        "user_id": to_object_id(user_id)
     })
     
     if result.deleted_count == 0:
@@ -148,7 +142,7 @@ def clear_all_notifications():
     user_id = get_jwt_identity()
     
     result = mongo.notifications.delete_many({
-        "user_id": ObjectId(user_id)
+        "user_id": to_object_id(user_id)
     })
     
     return jsonify({
@@ -171,7 +165,7 @@ def poll_notifications():
     since = request.args.get("since")
     
     query = {
-        "user_id": ObjectId(user_id),
+        "user_id": to_object_id(user_id),
         "read": False
     }
     
@@ -188,12 +182,6 @@ def poll_notifications():
         .limit(50)
     )
     
-    for notif in notifications:
-        notif["_id"] = str(notif["_id"])
-        notif["user_id"] = str(notif["user_id"])
-        if notif.get("created_at"):
-            notif["created_at"] = notif["created_at"].isoformat()
-    
     return jsonify({
         "notifications": notifications,
         "timestamp": datetime.utcnow().isoformat()
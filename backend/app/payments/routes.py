@@ -4,6 +4,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.payments.services.finternet import FinternetService
 from app.core import PaymentService, NotificationService
 from app.extensions import db as mongo
+from app.utils.ids import to_object_id
 from bson import ObjectId
 import os
 import logging
@@ -311,7 +312,10 @@ def simulate_success(intent_id):
         # Handle wallet topup
         elif purpose == "wallet_topup" and user_id:
             from app.core import WalletFallbackService
-            WalletFallbackService.credit_wallet(user_id, amount, intent_id)
+            credited, _ = WalletFallbackService.credit_wallet(user_id, amount, intent_id)
+            if not credited:
+                logger.error(f"[MOCK] Failed to credit wallet top-up for user {user_id}, amount {amount}")
+                return jsonify({"error": "Invalid top-up amount"}), 400
             NotificationService.notify_payment_confirmed(
                 user_id=user_id,
                 amount=amount,
@@ -464,12 +468,17 @@ def payment_webhook():
             # Handle wallet topup
             elif purpose == "wallet_topup" and user_id:
                 from app.core import WalletFallbackService
-                WalletFallbackService.credit_wallet(user_id, amount, intent_id)
-                NotificationService.notify_payment_confirmed(
-                    user_id=user_id,
-                    amount=amount,
-                    purpose="Wallet Top-up"
-                )
+                credited, _ = WalletFallbackService.credit_wallet(user_id, amount, intent_id)
+                if credited:
+                    NotificationService.notify_payment_confirmed(
+                        user_id=user_id,
+                        amount=amount,
+                        purpose="Wallet Top-up"
+                    )
+                else:
+                    # Retrying can't fix an invalid amount, so the callback is
+                    # still marked processed below
+                    logger.error(f"Failed to credit wallet top-up for user {user_id}, amount {amount}")
             
             PaymentService.mark_callback_processed(callback_id)
             return jsonify({
@@ -592,7 +601,10 @@ def get_payment_tracking_status(intent_id):
                 
                 elif purpose == "wallet_topup":
                     from app.core import WalletFallbackService
-                    WalletFallbackService.credit_wallet(user_id, amount, intent_id)
+                    credited, _ = WalletFallbackService.credit_wallet(user_id, amount, intent_id)
+                    if not credited:
+                        logger.error(f"Failed to credit wallet top-up for user {user_id}, amount {amount}")
+                        return jsonify({"error": "Invalid top-up amount"}), 400
                     NotificationService.notify_payment_confirmed(
                         user_id=user_id,
                         amount=amount,
@@ -740,7 +752,7 @@ def create_deposit_intent():
         # Store payment tracking record as confirmed
         mongo.payment_tracking.insert_one({
             "intent_id": intent_id,
-            "user_id": ObjectId(user_id),
+            "user_id": to_object_id(user_id),
             "event_id": ObjectId(event_id),
             "purpose": "deposit",
             "amount": amount,
@@ -816,7 +828,7 @@ def create_topup_intent():
         # Store payment tracking record
         mongo.payment_tracking.insert_one({
             "intent_id": intent_id,
-            "user_id": ObjectId(user_id),
+            "user_id": to_object_id(user_id),
             "purpose": "wallet_topup",
             "amount": amount,
             "status": "initiated",
@@ -859,7 +871,7 @@ def create_debt_settlement_intent():
     if debt_id:
         debt = mongo.debts.find_one({
             "_id": ObjectId(debt_id),
-            "user_id": ObjectId(user_id),
+            "user_id": to_object_id(user_id),
             "status": {"$in": ["outstanding", "partially_paid"]}
         })
         if not debt:
@@ -898,7 +910,7 @@ def create_debt_settlement_intent():
         # Store payment tracking record
         mongo.payment_tracking.insert_one({
             "intent_id": intent_id,
-            "user_id": ObjectId(user_id),
+            "user_id": to_object_id(user_id),
             "debt_id": ObjectId(debt_id) if debt_id else None,
             "purpose": "debt_settlement",
             "amount": amount,
@@ -4,6 +4,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.settlements.services import SettlementCalculator
 from app.core import DebtService, NotificationService, ReliabilityService
 from app.extensions import db as mongo
+from app.utils.ids import to_object_id
 from bson import ObjectId
 from datetime import datetime
 
@@ -167,6 +168,7 @@ def finalize(event_id):
     Marks the event as settled.
     """
     from app.extensions import db as mongo
+    from app.events.routes import invalidate_invite_cache
     from bson import ObjectId
     
     try:
@@ -181,10 +183,12 @@ def finalize(event_id):
             }), 400
         
         # Mark event as settled
-        mongo.events.update_one(
+        event = mongo.events.find_one_and_update(
             {"_id": ObjectId(event_id)},
-            {"$set": {"status": "settled", "settled_at": __import__("datetime").datetime.utcnow()}}
+            {"$set": {"status": "settled", "settled_at": __import__("datetime").datetime.utcnow()}},
+            projection={"invite_code": 1}
         )
+        invalidate_invite_cache(event)
         
         return jsonify({
             "event_id": event_id,
@@ -225,7 +229,7 @@ def settle_specific_debt(debt_id):
     
     debt = mongo.debts.find_one({
         "_id": ObjectId(debt_id),
-        "user_id": ObjectId(user_id),
+        "user_id": to_object_id(user_id),
         "status": {"$in": ["outstanding", "partially_paid"]}
     })
     
@@ -248,7 +252,7 @@ def settle_specific_debt(debt_id):
         # Store payment tracking
         mongo.payment_tracking.insert_one({
             "intent_id": intent_id,
-            "user_id": ObjectId(user_id),
+            "user_id": to_object_id(user_id),
             "debt_id": ObjectId(debt_id),
             "purpose": "debt_settlement",
             "amount": float(amount),
@@ -1,7 +1,7 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from bson import ObjectId
-from app.extensions import db as mongo
+from app.extensions import db as mongo, executor
+from app.utils.ids import to_object_id
 import re
 
 users_bp = Blueprint("users", __name__)
@@ -10,12 +10,11 @@ users_bp = Blueprint("users", __name__)
 @jwt_required()
 def profile():
     uid = get_jwt_identity()
-    user = mongo.users.find_one({"_id": ObjectId(uid)}, {"password_hash": 0})
+    user = mongo.users.find_one({"_id": to_object_id(uid)}, {"password_hash": 0})
 
     if not user:
         return jsonify({"error": "User not found"}), 404
 
-    user["_id"] = str(user["_id"])
     return jsonify(user)
 
 
@@ -23,35 +22,42 @@ def profile():
 @jwt_required()
 def summary():
     uid = get_jwt_identity()
-    user_oid = ObjectId(uid)
+    user_oid = to_object_id(uid)
 
-    # Count events user participates in
-    events_count = mongo.participants.count_documents({"user_id": user_oid})
-    
-    # Count expenses added by user
-    expense_count = mongo.expenses.count_documents({"payer_id": user_oid})
-    
-    # Aggregate total expense amount for expenses added by user
-    total_expense_pipeline = [
+    # Count expenses added by user and total their amount in one pass
+    expense_pipeline = [
         {"$match": {"payer_id": user_oid}},
-        {"$group": {"_id": None, "total": {"$sum": "$amount"}}}
+        {"$group": {
+            "_id": None,
+            "count": {"$sum": 1},
+            "total": {"$sum": "$amount"}
+        }}
     ]
-    total_expense_result = list(mongo.expenses.aggregate(total_expense_pipeline))
-    total_expense_amount = total_expense_result[0]["total"] if total_expense_result else 0
     
-    # Get user's balance across all events (sum of participant balances)
-    # This reflects deposits minus their share of expenses
-    balance_pipeline = [
+    # Count events and sum participant balances in one pass
+    # Balance reflects deposits minus their share of expenses
+    participant_pipeline = [
         {"$match": {"user_id": user_oid}},
         {"$group": {
-            "_id": None, 
+            "_id": None,
+            "events": {"$sum": 1},
             "total_balance": {"$sum": "$balance"},
             "total_deposits": {"$sum": "$deposit_amount"}
         }}
     ]
-    balance_result = list(mongo.participants.aggregate(balance_pipeline))
-    total_balance = balance_result[0]["total_balance"] if balance_result else 0
-    total_deposits = balance_result[0]["total_deposits"] if balance_result else 0
+    
+    # The two aggregations are independent - run them concurrently
+    expense_future = executor.submit(
+        lambda: next(mongo.expenses.aggregate(expense_pipeline), {})
+    )
+    participant_result = next(mongo.participants.aggregate(participant_pipeline), {})
+    expense_result = expense_future.result()
+    
+    expense_count = expense_result.get("count", 0)
+    total_expense_amount = expense_result.get("total", 0)
+    events_count = participant_result.get("events", 0)
+    total_balance = participant_result.get("total_balance", 0)
+    total_deposits = participant_result.get("total_deposits", 0)
     
     # Calculate net position (positive = owed money, negative = owes money)
     net_position = round(total_balance, 2)
@@ -85,7 +91,7 @@ def search_users():
     # Search by email or name, excluding current user
     users = list(mongo.users.find(
         {
-            "_id": {"$ne": ObjectId(current_user_id)},
+            "_id": {"$ne": to_object_id(current_user_id)},
             "$or": [
                 {"email": regex_pattern},
                 {"name": regex_pattern}
@@ -94,8 +100,4 @@ def search_users():
         {"_id": 1, "name": 1, "email": 1}
     ).limit(10))
     
-    # Format response
-    for user in users:
-        user["_id"] = str(user["_id"])
-    
     return jsonify({"users": users})
\ No newline at end of file
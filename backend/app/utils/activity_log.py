@@ -0,0 +1,77 @@
+"""Background writer for activity feed entries."""
+import atexit
+import queue
+import threading
+
+from pymongo.errors import PyMongoError
+
+from app.extensions import db as mongo
+
+# Activity entries are append-only and nothing in the request reads them
+# back, so they are queued and written in batches off the request path.
+_queue = queue.Queue(maxsize=10_000)
+_BATCH_SIZE = 200
+_FLUSH_INTERVAL = 0.1  # seconds
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def _drain(block):
+    """Pop up to _BATCH_SIZE queued entries, waiting for the first if block."""
+    batch = []
+    try:
+        batch.append(_queue.get(timeout=_FLUSH_INTERVAL) if block else _queue.get_nowait())
+        while len(batch) < _BATCH_SIZE:
+            batch.append(_queue.get_nowait())
+    except queue.Empty:
+        pass
+    return batch
+
+
+def _write(batch):
+    try:
+        mongo.activities.insert_many(batch, ordered=False)
+    except PyMongoError as e:
+        print(f"[ActivityLog] Failed to write {len(batch)} activities: {e}")
+
+
+def _run():
+    while True:
+        batch = _drain(block=True)
+        if batch:
+            _write(batch)
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name="activity-log", daemon=True)
+            _worker.start()
+
+
+def log_activity(activity):
+    """
+    Queue an activity document for insertion.
+
+    Falls back to a synchronous insert when the queue is full so entries
+    are never dropped.
+    """
+    _ensure_worker()
+    try:
+        _queue.put_nowait(activity)
+    except queue.Full:
+        mongo.activities.insert_one(activity)
+
+
+@atexit.register
+def flush():
+    """Write out anything still queued."""
+    while True:
+        batch = _drain(block=False)
+        if not batch:
+            return
+        _write(batch)
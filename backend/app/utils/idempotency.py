@@ -0,0 +1,87 @@
+"""Idempotency-Key support for endpoints that must not run twice."""
+import hashlib
+from datetime import datetime
+from functools import wraps
+
+import orjson
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity
+from pymongo.errors import DuplicateKeyError
+
+from app.extensions import db as mongo
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+def _sha256(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def idempotent(view):
+    """
+    Run view at most once per (user, path, Idempotency-Key header).
+
+    The first request claims the key and its response is stored; a retry
+    with the same key and body gets that response replayed instead of
+    running the view again. Requests without the header are unaffected.
+    Must be applied under @jwt_required(). Records expire through the TTL
+    index on idempotency_keys.created_at.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view(*args, **kwargs)
+
+        record_id = _sha256(get_jwt_identity(), request.path, key)
+        body_hash = _sha256(orjson.dumps(
+            request.get_json(silent=True), option=orjson.OPT_SORT_KEYS
+        ))
+
+        try:
+            mongo.idempotency_keys.insert_one({
+                "_id": record_id,
+                "body_hash": body_hash,
+                "status": "in_flight",
+                "created_at": datetime.utcnow()
+            })
+        except DuplicateKeyError:
+            record = mongo.idempotency_keys.find_one({"_id": record_id})
+            if record is None:
+                # Expired or released between the insert and this read
+                return jsonify({"error": "Request in progress, retry shortly"}), 409
+            if record["body_hash"] != body_hash:
+                return jsonify({"error": "Idempotency key was already used for a different request"}), 422
+            if record["status"] != "completed":
+                return jsonify({"error": "Request in progress, retry shortly"}), 409
+            return current_app.response_class(
+                record["body"],
+                status=record["status_code"],
+                mimetype="application/json"
+            )
+
+        try:
+            response = current_app.make_response(view(*args, **kwargs))
+        except Exception:
+            mongo.idempotency_keys.delete_one({"_id": record_id})
+            raise
+
+        if response.status_code >= 500:
+            # Let the client retry a failure with the same key
+            mongo.idempotency_keys.delete_one({"_id": record_id})
+        else:
+            mongo.idempotency_keys.update_one(
+                {"_id": record_id},
+                {"$set": {
+                    "status": "completed",
+                    "status_code": response.status_code,
+                    "body": response.get_data()
+                }}
+            )
+        return response
+
+    return wrapper
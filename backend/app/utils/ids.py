@@ -0,0 +1,27 @@
+"""ObjectId helpers."""
+from functools import lru_cache
+
+from bson import ObjectId
+from flask_jwt_extended import get_jwt_identity
+
+
+@lru_cache(maxsize=4096)
+def to_object_id(value: str) -> ObjectId:
+    """
+    Parse a hex id string into an ObjectId.
+    
+    Memoized because the same identities (mostly the JWT user id) are
+    parsed on every request. ObjectId is immutable, so sharing is safe.
+    """
+    return ObjectId(value)
+
+
+def current_user_oid() -> ObjectId:
+    """
+    The authenticated user's id as an ObjectId.
+    
+    Call from inside @jwt_required(). Identities come from tokens this app
+    signed, so they are always valid hex; repeat requests from the same
+    user reuse the parsed ObjectId through to_object_id's cache.
+    """
+    return to_object_id(get_jwt_identity())
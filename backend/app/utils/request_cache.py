@@ -0,0 +1,25 @@
+"""Per-request memoization of documents read several times in one request."""
+from flask import g, has_request_context
+
+from app.extensions import db as mongo
+from app.utils.ids import to_object_id
+
+
+def get_event(event_id):
+    """
+    Fetch an event by id, reusing the document if this request already
+    loaded it.
+
+    Validation paths (route, rules, pool check) each look the event up on
+    their own; this lets them share one read. The cached document reflects
+    the event as of the first read, so don't use it after writing to the
+    event in the same request. Outside a request it is a plain find_one.
+    """
+    event_oid = to_object_id(event_id)
+    if not has_request_context():
+        return mongo.events.find_one({"_id": event_oid})
+
+    cache = g.setdefault("_event_cache", {})
+    if event_oid not in cache:
+        cache[event_oid] = mongo.events.find_one({"_id": event_oid})
+    return cache[event_oid]
@@ -1,10 +1,11 @@
 """Wallet routes for personal wallet management."""
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from bson import ObjectId
 from datetime import datetime
 
 from app.extensions import db as mongo
+from app.utils.ids import to_object_id
 from app.core import WalletFallbackService, NotificationService
 from app.payments.services.finternet import FinternetService
 
@@ -100,7 +101,7 @@ def deposit():
             
             # Store deposit record (already completed)
             mongo.wallet_deposits.insert_one({
-                "user_id": ObjectId(user_id),
+                "user_id": to_object_id(user_id),
                 "intent_id": intent_id,
                 "amount": amount,
                 "status": "completed",
@@ -162,7 +163,7 @@ def confirm_deposit():
         # Check if deposit already processed
         existing = mongo.pending_wallet_deposits.find_one({
             "intent_id": intent_id,
-            "user_id": ObjectId(user_id)
+            "user_id": to_object_id(user_id)
         })
         
         if not existing:
@@ -273,7 +274,7 @@ def withdraw():
     
     # Record the fee/donation
     mongo.company_donations.insert_one({
-        "user_id": ObjectId(user_id),
+        "user_id": to_object_id(user_id),
         "type": "withdrawal_fee",
         "gross_amount": amount,
         "fee_amount": fee,
@@ -337,32 +338,21 @@ def get_transactions():
     per_page = int(request.args.get("per_page", 20))
     skip = (page - 1) * per_page
     
-    # Get transactions
-    transactions = list(
-        mongo.wallet_transactions.find({"user_id": ObjectId(user_id)})
-        .sort("created_at", -1)
-        .skip(skip)
-        .limit(per_page)
-    )
-    
     # Count total
-    total = mongo.wallet_transactions.count_documents({"user_id": ObjectId(user_id)})
-    
-    # Format response
-    for tx in transactions:
-        tx["_id"] = str(tx["_id"])
-        tx["wallet_id"] = str(tx["wallet_id"])
-        tx["user_id"] = str(tx["user_id"])
-        if tx.get("created_at"):
-            tx["created_at"] = tx["created_at"].isoformat()
+    total = mongo.wallet_transactions.count_documents({"user_id": to_object_id(user_id)})
+    pages = (total + per_page - 1) // per_page
+    
+    # Stream the page straight from the cursor instead of building a list
+    def generate():
+        yield f'{{"page": {page}, "per_page": {per_page}, "total": {total}, "pages": {pages}, "transactions": ['
+        transactions = WalletFallbackService.iter_wallet_transactions(
+            user_id, limit=per_page, skip=skip
+        )
+        for i, tx in enumerate(transactions):
+            yield ("," if i else "") + current_app.json.dumps(tx)
+        yield "]}"
     
-    return jsonify({
-        "transactions": transactions,
-        "page": page,
-        "per_page": per_page,
-        "total": total,
-        "pages": (total + per_page - 1) // per_page
-    })
+    return Response(stream_with_context(generate()), mimetype="application/json")
 
 
 @bp.route("/transfer", methods=["POST"])
@@ -413,7 +403,7 @@ def transfer():
         return jsonify({"error": error}), 400
     
     # Credit recipient
-    sender = mongo.users.find_one({"_id": ObjectId(user_id)})
+    sender = mongo.users.find_one({"_id": to_object_id(user_id)})
     WalletFallbackService.credit_wallet(
         user_id=to_user_id,
         amount=amount,
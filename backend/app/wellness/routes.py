@@ -10,6 +10,7 @@ from bson import ObjectId
 
 from app.services.financial_wellness import get_wellness_service
 from app.extensions import db as mongo
+from app.utils.ids import to_object_id
 
 wellness_bp = Blueprint("wellness", __name__)
 
@@ -103,7 +104,7 @@ def dismiss_reminder():
         # Store dismissed reminders
         mongo.dismissed_reminders.update_one(
             {
-                "user_id": ObjectId(user_id),
+                "user_id": to_object_id(user_id),
                 "reminder_type": reminder_type,
                 "reference_id": reference_id
             },
@@ -145,7 +146,7 @@ def get_spending_breakdown():
         
         # Get expenses where user paid
         expenses = list(mongo.expenses.find({
-            "payer_id": ObjectId(user_id),
+            "payer_id": to_object_id(user_id),
             "created_at": {"$gte": cutoff_date}
         }))
         
@@ -0,0 +1,21 @@
+"""
+Gunicorn settings for serving the API in production:
+
+    gunicorn -c gunicorn.conf.py run:app
+
+Every route spends most of its time waiting on MongoDB, and PyMongo
+releases the GIL while it waits, so threaded workers overlap requests
+without monkeypatching the driver the way gevent/meinheld would.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count()))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 8))
+
+# Keep client connections open between requests instead of paying a new
+# TCP handshake (and leaving a TIME_WAIT socket) per request
+keepalive = 5
+timeout = 60
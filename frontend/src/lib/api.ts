@@ -59,6 +59,7 @@ export interface Event {
   total_pool: number;
   total_spent: number;
   participants?: Participant[];
+  participant_count?: number;
   rules?: {
     spending_limit?: number;
     approval_required?: boolean;
@@ -234,8 +235,9 @@ export const eventsAPI = {
   list: (params?: { page?: number; limit?: number; sort?: string; order?: 'asc' | 'desc'; status?: string }) =>
     api.get<{ events: Event[]; pagination: Pagination }>('/events/', { params }),
 
-  // Get a single event by ID
-  get: (id: string) => api.get<{ event: Event }>(`/events/${id}`),
+  // Get a single event by ID, with its participant list
+  get: (id: string) =>
+    api.get<{ event: Event }>(`/events/${id}`, { params: { include: 'participants' } }),
 
   // Join an event by event ID (deprecated, use joinByCode instead)
   join: (id: string) => api.post<{ message: string }>(`/events/${id}/join`),
@@ -371,7 +373,8 @@ export const eventsAPI = {
     }>(`/events/${id}/recalculate-pool`),
 
   // Alias for get (some components use getById)
-  getById: (id: string) => api.get<Event>(`/events/${id}`),
+  getById: (id: string) =>
+    api.get<Event>(`/events/${id}`, { params: { include: 'participants' } }),
 };
 
 // =====================